@@ -2,12 +2,13 @@
 Banner module for dashtrash - handles ASCII art and startup display
 """
 
-import pyfiglet
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.align import Align
 
+from .figlet import render as render_figlet
+
 
 class Banner:
     def __init__(self, text="DashTrash", font="ansi_shadow", tagline="Real-time dashboards. Questionable aesthetics."):
@@ -18,12 +19,8 @@ class Banner:
 
     def render(self):
         """Render the banner with ASCII art and tagline"""
-        try:
-            # Generate ASCII art
-            ascii_art = pyfiglet.figlet_format(self.text, font=self.font)
-        except Exception:
-            # Fallback to basic font if the specified font isn't available
-            ascii_art = pyfiglet.figlet_format(self.text, font="standard")
+        # Generate ASCII art (falls back to the standard font if this one isn't available)
+        ascii_art = render_figlet(self.text, self.font)
         
         # Create styled text
         banner_text = Text(ascii_art, style="bold cyan")
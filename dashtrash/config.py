@@ -2,32 +2,173 @@
 Configuration module for dashtrash - handles YAML parsing and validation
 """
 
-import yaml
 import os
-from typing import Dict, List, Any, Optional
+import pickle
+import zlib
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+from . import __version__
+
+
+# Named panel positions understood by the layout
+PANEL_POSITIONS = ('top', 'left', 'right', 'bottom', 'main')
+
+# Line formats understood by logs panels
+LOG_FORMATS = ('text', 'json')
+
+# Suffixes accepted in durations such as "15m"
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Bump when what the config cache stores changes, so old entries are ignored
+CACHE_VERSION = 1
+
+
+def _yaml():
+    """Import PyYAML on first use; a config served from the cache never needs it"""
+    import yaml
+    return yaml
+
+
+def get_cache_dir() -> Path:
+    """Get the directory parsed configs are cached in ($XDG_CACHE_HOME/dashtrash)"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'dashtrash'
+
+
+def parse_duration(value: Any) -> Optional[float]:
+    """Parse a duration like 90, "90s", "15m" or "2h" into seconds, or None if it isn't one"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else None
+    if not isinstance(value, str) or not value.strip():
+        return None
+    
+    text = value.strip().lower()
+    unit = DURATION_UNITS.get(text[-1])
+    number = text[:-1] if unit else text
+    try:
+        seconds = float(number) * (unit or 1)
+    except ValueError:
+        return None
+    return seconds if seconds > 0 else None
+
+
+def assign_panel_ids(panels: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Pair each panel config with a unique id
+
+    Panels keep their explicit `id`; the rest are named after their type (or
+    plugin), with a numeric suffix from the second instance on: logs, logs_2...
+    """
+    taken = {str(panel['id']) for panel in panels if isinstance(panel, dict) and 'id' in panel}
+    entries = []
+    
+    for panel in panels:
+        if 'id' in panel:
+            entries.append((str(panel['id']), panel))
+            continue
+        
+        if panel.get('type') == 'plugin':
+            base = f"plugin_{panel.get('plugin_name')}"
+        else:
+            base = str(panel.get('type'))
+        
+        panel_id = base
+        suffix = 2
+        while panel_id in taken:
+            panel_id = f"{base}_{suffix}"
+            suffix += 1
+        taken.add(panel_id)
+        entries.append((panel_id, panel))
+    
+    return entries
+
 
 class Config:
     def __init__(self, config_path: str = "dashboard.yml"):
         self.config_path = config_path
         self.config = {}
+        self._problems = None
+        self._cache_key = None
+        self.load_error = None
         self.load_config()
 
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any], config_path: str = "dashboard.yml") -> "Config":
+        """Create a config from already parsed settings, e.g. ones received from a collector"""
+        instance = cls.__new__(cls)
+        instance.config_path = config_path
+        instance.config = config
+        instance._problems = None
+        instance._cache_key = None
+        instance.load_error = None
+        return instance
+
     def load_config(self):
-        """Load and parse the YAML configuration file"""
+        """Load the configuration, from the parsed-config cache if the file hasn't changed"""
+        self._problems = None
+        self._cache_key = None
+        self.load_error = None
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as file:
-                    self.config = yaml.safe_load(file) or {}
+                stat = os.stat(self.config_path)
+                # Validation rules change between releases, so the version is part of the key
+                key = (__version__, os.path.abspath(self.config_path), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+                if not self._load_cache(key):
+                    self.config = self._parse()
+                    self._cache_key = key
             else:
                 # Use default configuration
                 self.config = self._get_default_config()
                 self._create_default_config_file()
         except Exception as e:
             print(f"Error loading config: {e}")
+            self.load_error = str(e)
             self.config = self._get_default_config()
 
+    def _parse(self) -> Dict[str, Any]:
+        """Parse the YAML file, with libyaml's C loader when PyYAML was built with it"""
+        yaml = _yaml()
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        with open(self.config_path, 'r') as file:
+            return yaml.load(file, Loader=loader) or {}
+
+    def _cache_file(self) -> Path:
+        """Get the cache file for this config path"""
+        path = os.path.abspath(self.config_path)
+        return get_cache_dir() / f"config-{zlib.crc32(path.encode()):08x}.pickle"
+
+    def _load_cache(self, key: tuple) -> bool:
+        """Use the cached config and validation result if they are for this exact file"""
+        try:
+            with open(self._cache_file(), 'rb') as file:
+                entry = pickle.load(file)
+            if entry.get('version') != CACHE_VERSION or entry.get('key') != key:
+                return False
+        except Exception:
+            return False
+        self.config = entry['config']
+        self._problems = entry['problems']
+        return True
+
+    def _save_cache(self):
+        """Cache the parsed and validated config, keyed by dashtrash's version and the file's path, mtime, size and inode"""
+        if self._cache_key is None or self._problems is None:
+            return
+        entry = {'version': CACHE_VERSION, 'key': self._cache_key,
+                 'config': self.config, 'problems': self._problems}
+        cache_file = self._cache_file()
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with open(temp_file, 'wb') as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except Exception:
+            # A read-only or full cache directory only costs the next launch a parse
+            pass
+
     def _get_default_config(self) -> Dict[str, Any]:
         """Return default configuration"""
         return {
@@ -57,7 +198,7 @@ class Config:
         """Create a default configuration file if it doesn't exist"""
         try:
             with open(self.config_path, 'w') as file:
-                yaml.dump(self.config, file, default_flow_style=False, indent=2)
+                _yaml().dump(self.config, file, default_flow_style=False, indent=2)
         except Exception as e:
             print(f"Warning: Could not create default config file: {e}")
 
@@ -65,6 +206,10 @@ class Config:
         """Get panel configurations"""
         return self.config.get('panels', [])
 
+    def get_panel_entries(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Get (panel id, panel config) pairs in config order"""
+        return assign_panel_ids(self.get_panels())
+
     def get_banner_config(self) -> Dict[str, str]:
         """Get banner configuration"""
         return self.config.get('banner', {
@@ -77,6 +222,18 @@ class Config:
         """Get global refresh rate"""
         return self.config.get('refresh_rate', 1.0)
 
+    def get_layout_config(self) -> Dict[str, Any]:
+        """Get grid layout configuration"""
+        return self.config.get('layout', {})
+
+    def get_history_dir(self) -> Optional[str]:
+        """Get the directory for persistent metric history, if enabled"""
+        return self.config.get('history_dir')
+
+    def get_fetch_workers(self) -> int:
+        """Get the number of threads used to fetch panel data"""
+        return self.config.get('fetch_workers', 4)
+
     def get_panel_config(self, panel_type: str) -> Optional[Dict[str, Any]]:
         """Get configuration for a specific panel type"""
         for panel in self.get_panels():
@@ -85,25 +242,63 @@ class Config:
         return None
 
     def validate_config(self) -> bool:
-        """Validate the configuration structure"""
+        """Validate the configuration structure, printing what is wrong with it"""
+        problems = self.get_problems()
+        for problem in problems:
+            print(problem)
+        return not problems
+
+    def get_problems(self) -> List[str]:
+        """Get what is wrong with the configuration structure, validating only on a cache miss"""
+        if self._problems is None:
+            self._problems = self._check_config()
+            self._save_cache()
+        return self._problems
+
+    def _check_config(self) -> List[str]:
+        """Get what is wrong with the configuration structure, if anything"""
         required_keys = ['panels']
         for key in required_keys:
             if key not in self.config:
-                print(f"Missing required configuration key: {key}")
-                return False
+                return [f"Missing required configuration key: {key}"]
         
         # Validate panels
         panels = self.get_panels()
         if not isinstance(panels, list):
-            print("'panels' must be a list")
-            return False
+            return ["'panels' must be a list"]
         
         for i, panel in enumerate(panels):
             if not isinstance(panel, dict):
-                print(f"Panel {i} must be a dictionary")
-                return False
+                return [f"Panel {i} must be a dictionary"]
             if 'type' not in panel:
-                print(f"Panel {i} missing required 'type' field")
-                return False
+                return [f"Panel {i} missing required 'type' field"]
+            if 'position' in panel and panel['position'] not in PANEL_POSITIONS:
+                return [f"Panel {i} has unknown position '{panel['position']}' "
+                        f"(expected one of: {', '.join(PANEL_POSITIONS)})"]
+            if 'format' in panel and panel['format'] not in LOG_FORMATS:
+                return [f"Panel {i} has unknown format '{panel['format']}' "
+                        f"(expected one of: {', '.join(LOG_FORMATS)})"]
+            if 'window' in panel and parse_duration(panel['window']) is None:
+                return [f"Panel {i} 'window' must be a duration like 90s, 15m or 2h"]
+            for key, minimum in (('row', 0), ('column', 0), ('span', 1)):
+                if key in panel and (not isinstance(panel[key], int) or panel[key] < minimum):
+                    return [f"Panel {i} '{key}' must be an integer >= {minimum}"]
+        
+        ids = set()
+        for i, panel in enumerate(panels):
+            if 'id' not in panel:
+                continue
+            if not isinstance(panel['id'], str) or not panel['id']:
+                return [f"Panel {i} 'id' must be a non-empty string"]
+            if panel['id'] in ids:
+                return [f"Panel {i} has duplicate id '{panel['id']}'"]
+            ids.add(panel['id'])
+        
+        layout = self.get_layout_config()
+        if not isinstance(layout, dict):
+            return ["'layout' must be a dictionary"]
+        rows = layout.get('rows', [])
+        if not isinstance(rows, list) or not all(isinstance(r, int) and r > 0 for r in rows):
+            return ["'layout.rows' must be a list of positive integers"]
         
-        return True 
\ No newline at end of file
+        return [] 
\ No newline at end of file
@@ -3,10 +3,12 @@ Core dashboard engine for dashtrash - orchestrates panels and rendering
 """
 
 import asyncio
+import os
 import time
 import signal
 import sys
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from rich.console import Console
 from rich.live import Live
 from rich.layout import Layout
@@ -16,19 +18,232 @@ from rich.align import Align
 
 from .config import Config
 from .banner import Banner
-from .panels import SystemPanel, LogsPanel, TemperaturePanel, ClockPanel
-from .plugins import PluginManager
+from .layout import LayoutPlan
+from .watcher import create_watcher
+from .panels import get_panel_class
+from .plugins import PluginManager, PluginPanel
+
+
+# Floor for refresh intervals so a "0" in the config can't spin the loop
+MIN_REFRESH_INTERVAL = 0.1
+
+# How long a single panel fetch may take before its data is shown as stale
+DEFAULT_FETCH_TIMEOUT = 5.0
+
+# Panel types cheap enough to fetch directly on the event loop by default;
+# everything else runs on the fetch thread pool
+INLINE_PANEL_TYPES = {'clock'}
+
+# Panel types that read system metrics through the shared sampler
+SAMPLER_PANEL_TYPES = {'system', 'temperature', 'clock'}
+
+# Panels woken by file changes still refresh at least this often, so a
+# missed event or a vanished file shows up eventually
+WATCHED_REFRESH_INTERVAL = 30.0
+
+# Scheduler key for the header clock, which ticks at the global refresh rate
+HEADER_KEY = '__header__'
+
+# Editors save in several writes; the config is reloaded once it has been
+# quiet for this long
+CONFIG_RELOAD_DELAY = 0.25
+
+# Panel config keys the dashboard itself uses; changing only these keeps the
+# panel object as it is
+ENTRY_KEYS = ('id', 'position', 'row', 'column', 'span', 'refresh_interval', 'timeout', 'executor')
+
+# Panel config keys that decide where a panel is drawn
+PLACEMENT_KEYS = ('position', 'row', 'column', 'span')
+
+
+class PanelScheduler:
+    """Tracks a monotonic deadline per panel so each one refreshes on its own interval"""
+
+    def __init__(self, default_interval: float = 1.0):
+        self.default_interval = default_interval
+        self._intervals = {}
+        self._deadlines = {}
+        self._last_due = {}
+
+    def add(self, key: str, interval: Optional[float] = None):
+        """Register a panel; it becomes due immediately"""
+        if interval is None:
+            interval = self.default_interval
+        self._intervals[key] = max(float(interval), MIN_REFRESH_INTERVAL)
+        self._deadlines[key] = time.monotonic()
+
+    def set_interval(self, key: str, interval: float):
+        """Change the refresh interval of a panel, keeping its current deadline"""
+        self._intervals[key] = max(float(interval), MIN_REFRESH_INTERVAL)
+
+    def wake(self, key: str, min_gap: float = 0.0) -> bool:
+        """Make a panel due right away, or min_gap seconds after it was last due if that is later
+
+        Returns whether that moved its deadline; waking an already woken panel doesn't.
+        """
+        if key not in self._deadlines:
+            return False
+        now = time.monotonic()
+        last_due = self._last_due.get(key)
+        if last_due is not None:
+            now = max(now, last_due + min_gap)
+        if now >= self._deadlines[key]:
+            return False
+        self._deadlines[key] = now
+        return True
+
+    def remove(self, key: str):
+        """Stop scheduling a panel"""
+        self._intervals.pop(key, None)
+        self._deadlines.pop(key, None)
+        self._last_due.pop(key, None)
+
+    def interval(self, key: str) -> float:
+        """Get the refresh interval of a panel"""
+        return self._intervals.get(key, self.default_interval)
+
+    def due(self, now: float) -> List[str]:
+        """Get the keys of all panels whose deadline has passed"""
+        return [key for key, deadline in self._deadlines.items() if deadline <= now]
+
+    def advance(self, key: str, now: float):
+        """Move a panel's deadline forward by whole intervals"""
+        interval = self._intervals[key]
+        # Step from the previous deadline rather than from `now`, so time spent
+        # fetching and rendering doesn't accumulate as drift
+        deadline = self._deadlines[key] + interval
+        if deadline <= now:
+            # Fell behind (slow fetch, suspended laptop): skip the missed ticks
+            # instead of firing them back to back
+            deadline += ((now - deadline) // interval + 1) * interval
+        self._deadlines[key] = deadline
+        self._last_due[key] = now
+
+    def next_deadline(self) -> float:
+        """Get the monotonic time at which the next panel becomes due"""
+        if not self._deadlines:
+            return time.monotonic() + self.default_interval
+        return min(self._deadlines.values())
+
+
+class PanelState:
+    """The last good snapshot of a panel's data and the refresh running in the background"""
+
+    def __init__(self):
+        self.data = None
+        self.updated_at = None
+        self.error = None
+        self.task = None
+        self.age_label = ""
+        self.dirty = True
+        self.wake_pending = False
+
+    @property
+    def refreshing(self) -> bool:
+        """Whether a background refresh is in flight"""
+        return self.task is not None and not self.task.done()
+
+    def update(self, data: Dict[str, Any]):
+        """Replace the snapshot with freshly fetched data, marking it dirty if it changed"""
+        if data != self.data or self.error is not None:
+            self.dirty = True
+        self.data = data
+        self.updated_at = time.monotonic()
+        self.error = None
+
+    def fail(self, message: str, data: Optional[Dict[str, Any]] = None):
+        """Record a failed refresh, keeping the last good snapshot if there is one"""
+        if message != self.error:
+            self.dirty = True
+        self.error = message
+        if self.data is None and data is not None:
+            self.data = data
+            self.dirty = True
+
+    def age(self, now: float) -> Optional[float]:
+        """Get the age of the snapshot in seconds"""
+        if self.updated_at is None:
+            return None
+        return max(0.0, now - self.updated_at)
+
+
+class PanelEntry:
+    """One configured panel instance with its own config, panel object and refresh state"""
+
+    def __init__(self, panel_id: str, index: int, config: Dict[str, Any], panel: Any):
+        self.id = panel_id
+        self.index = index
+        self.config = config
+        self.panel = panel
+        self.state = PanelState()
+        self.future = None
+
+    @property
+    def type(self) -> str:
+        """Get the configured panel type"""
+        return self.config.get('type')
+
+
+class PanelRegistry:
+    """Panel instances keyed by panel id, iterated in config order"""
+
+    def __init__(self):
+        self._entries = {}
+
+    def add(self, entry: PanelEntry):
+        """Register a panel instance"""
+        self._entries[entry.id] = entry
+        # Keep the dict in config order so iterating every frame needs no sorting
+        self._entries = dict(sorted(self._entries.items(), key=lambda item: item[1].index))
+
+    def replace(self, entries: List[PanelEntry]):
+        """Swap in a new set of panel instances, already in config order"""
+        self._entries = {entry.id: entry for entry in entries}
+
+    def remove(self, panel_id: str) -> Optional[PanelEntry]:
+        """Unregister a panel instance"""
+        return self._entries.pop(panel_id, None)
+
+    def get(self, panel_id: str) -> Optional[PanelEntry]:
+        """Get a panel instance by id"""
+        return self._entries.get(panel_id)
+
+    def __getitem__(self, panel_id: str) -> PanelEntry:
+        return self._entries[panel_id]
+
+    def __contains__(self, panel_id: str) -> bool:
+        return panel_id in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries.values()))
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class Dashboard:
-    def __init__(self, config_path: str = "dashboard.yml"):
-        self.config = Config(config_path)
+    def __init__(self, config_path: str = "dashboard.yml", config: Optional[Config] = None):
+        self.config = config or Config(config_path)
         self.console = Console()
         self.banner = Banner(**self.config.get_banner_config())
         self.plugin_manager = PluginManager()
-        self.panels = {}
+        self.panels = PanelRegistry()
+        self.layout_plan = None
         self.running = False
         self.refresh_rate = self.config.get_refresh_rate()
+        self.scheduler = PanelScheduler(self.refresh_rate)
+        # Created with the first panel that reads system metrics, so a
+        # logs-only dashboard never loads psutil
+        self.sampler = None
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.get_fetch_workers(),
+            thread_name_prefix="dashtrash-fetch"
+        )
+        self._wake = None
+        self.watcher = None
+        self._watch_callbacks = {}
+        self._reload_due = None
+        self._reload_message = ""
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -43,231 +258,307 @@ class Dashboard:
 
     def _initialize_panels(self):
         """Initialize all configured panels"""
-        panel_configs = self.config.get_panels()
-        
-        for panel_config in panel_configs:
-            panel_type = panel_config.get('type')
-            
-            if panel_type == 'system':
-                self.panels['system'] = SystemPanel(panel_config)
-            elif panel_type == 'logs':
-                self.panels['logs'] = LogsPanel(panel_config)
-            elif panel_type == 'temperature':
-                self.panels['temperature'] = TemperaturePanel(panel_config)
-            elif panel_type == 'clock':
-                self.panels['clock'] = ClockPanel(panel_config)
-            elif panel_type == 'plugin':
-                plugin_name = panel_config.get('plugin_name')
-                if plugin_name:
-                    self.panels[f'plugin_{plugin_name}'] = {
-                        'type': 'plugin',
-                        'name': plugin_name,
-                        'config': panel_config
-                    }
-
-    def _create_layout(self) -> Layout:
-        """Create the main dashboard layout based on configured positions"""
-        layout = Layout()
-        
-        panel_configs = self.config.get_panels()
-        
-        # Collect all configured positions
-        positions = set()
-        for panel_config in panel_configs:
-            pos = panel_config.get('position')
-            if pos:
-                positions.add(pos)
-        
-        # Create layout based on actual positions used
-        if len(positions) <= 1:
-            # Single position layout
-            layout.add_split(Layout(name=next(iter(positions)) if positions else "main"))
-        elif positions == {"left", "right"}:
-            # Two panel side-by-side layout
-            layout.split_row(
-                Layout(name="left", ratio=1),
-                Layout(name="right", ratio=1)
-            )
-        elif "top" in positions and len(positions) == 3:
-            # Three panel layout with top, left, right
-            layout.split_column(
-                Layout(name="top", ratio=1),
-                Layout(name="bottom_row", ratio=1)
-            )
-            layout["bottom_row"].split_row(
-                Layout(name="left"),
-                Layout(name="right")
-            )
-        elif "top" in positions and "bottom" in positions:
-            # Four panel layout: top, left, right, bottom
-            layout.split_column(
-                Layout(name="top", ratio=1),
-                Layout(name="middle", ratio=1),
-                Layout(name="bottom", ratio=1)
-            )
-            layout["middle"].split_row(
-                Layout(name="left"),
-                Layout(name="right")
-            )
-        else:
-            # Default layout based on number of panels
-            num_panels = len(panel_configs)
-            if num_panels == 1:
-                layout.add_split(Layout(name="main"))
-            elif num_panels == 2:
-                layout.split_row(
-                    Layout(name="left", ratio=1),
-                    Layout(name="right", ratio=1)
-                )
-            else:
-                # Multi-panel default layout
-                layout.split_column(
-                    Layout(name="top", ratio=1),
-                    Layout(name="middle", ratio=1)
-                )
-                layout["middle"].split_row(
-                    Layout(name="left"),
-                    Layout(name="right")
-                )
-        
-        return layout
-
-    def _update_layout(self, layout: Layout):
-        """Update layout with current panel data"""
-        panel_configs = self.config.get_panels()
-        
-        for i, panel_config in enumerate(panel_configs):
-            panel_type = panel_config.get('type')
-            position = panel_config.get('position', None)
-            
-            try:
-                # Generate panel content
-                if panel_type == 'system' and 'system' in self.panels:
-                    data = self.panels['system'].fetch_data()
-                    panel = self.panels['system'].render(data)
-                    
-                elif panel_type == 'logs' and 'logs' in self.panels:
-                    data = self.panels['logs'].fetch_data()
-                    panel = self.panels['logs'].render(data)
-                    
-                elif panel_type == 'temperature' and 'temperature' in self.panels:
-                    data = self.panels['temperature'].fetch_data()
-                    panel = self.panels['temperature'].render(data)
-                    
-                elif panel_type == 'clock' and 'clock' in self.panels:
-                    data = self.panels['clock'].fetch_data()
-                    panel = self.panels['clock'].render(data)
-                    
-                elif panel_type == 'plugin':
-                    plugin_name = panel_config.get('plugin_name')
-                    panel = self._render_plugin_panel(plugin_name, panel_config)
-                    
-                else:
-                    panel = Panel(f"[red]Unknown panel type: {panel_type}[/red]", 
-                                title="[bold red]Error[/bold red]")
-                
-                # Place panel in correct layout position
-                target_position = self._get_panel_position(i, position, layout)
-                try:
-                    layout[target_position].update(panel)
-                except KeyError:
-                    # If position doesn't exist, create a simple fallback
-                    self.console.print(f"[yellow]Warning: Layout position '{target_position}' not found[/yellow]")
-                    # Try to update the first available position or create a basic layout
-                    if hasattr(layout, 'children') and layout.children:
-                        layout.children[0].update(panel)
-                    else:
-                        # Create a basic layout if none exists
-                        layout.add_split(Layout(name="main"))
-                        layout["main"].update(panel)
-                    
-            except Exception as e:
-                error_panel = Panel(f"[red]Error in {panel_type} panel: {str(e)}[/red]", 
-                                  title="[bold red]Panel Error[/bold red]")
-                target_position = self._get_panel_position(i, position, layout)
-                if target_position and target_position in layout:
-                    layout[target_position].update(error_panel)
-
-    def _get_panel_position(self, panel_index: int, configured_position: str, layout: Layout) -> str:
-        """Determine where to place a panel in the layout"""
-        # If position is explicitly configured, use it if it exists
-        if configured_position:
-            try:
-                # Test if the position exists by trying to access it
-                _ = layout[configured_position]
-                return configured_position
-            except KeyError:
-                # Position doesn't exist in current layout, continue to fallback logic
-                pass
-        
-        # Get panel configurations to understand layout structure
-        panel_configs = self.config.get_panels()
-        positions = set()
-        for panel_config in panel_configs:
-            pos = panel_config.get('position')
-            if pos:
-                positions.add(pos)
-        
-        # Fallback logic based on actual layout structure created
-        if len(positions) <= 1:
-            return "main"
-        elif positions == {"left", "right"}:
-            return ["left", "right"][panel_index % 2]
-        elif "top" in positions and len(positions) == 3:
-            # Layout: top, bottom_row with left/right
-            if configured_position == "top":
-                return "top"
-            elif configured_position in ["left", "right"]:
-                return configured_position
-            else:
-                # Fallback for panels without specific position
-                return ["top", "left", "right"][panel_index % 3]
-        elif "top" in positions and "bottom" in positions:
-            # Layout: top, middle (left/right), bottom
-            if configured_position in ["top", "bottom"]:
-                return configured_position
-            elif configured_position in ["left", "right"]:
-                return configured_position
-            else:
-                # Fallback
-                return ["top", "left", "right", "bottom"][panel_index % 4]
+        for index, (panel_id, panel_config) in enumerate(self.config.get_panel_entries()):
+            panel = self._create_panel(panel_config)
+            self.panels.add(PanelEntry(panel_id, index, panel_config, panel))
+            self.scheduler.add(panel_id, panel_config.get('refresh_interval', self.refresh_rate))
+        self._placement = self._get_placement()
+
+    def _create_panel(self, panel_config: Dict[str, Any]) -> Any:
+        """Create the panel object for a panel config, or None for an unknown type"""
+        panel_type = panel_config.get('type')
+        
+        if panel_type == 'plugin':
+            if not panel_config.get('plugin_name'):
+                return None
+            return PluginPanel(panel_config['plugin_name'], panel_config, self.plugin_manager)
+        
+        # Only the panel types in the config are ever imported
+        panel_class = get_panel_class(panel_type)
+        if panel_class is None:
+            return None
+        if panel_type in SAMPLER_PANEL_TYPES:
+            return panel_class(panel_config, sampler=self._get_sampler())
+        return panel_class(panel_config)
+
+    def _get_sampler(self) -> Any:
+        """Get the shared metrics sampler, creating it on first use"""
+        if self.sampler is None:
+            from .sampler import get_sampler
+            self.sampler = get_sampler()
+            if self.config.get_history_dir():
+                self.sampler.use_history_dir(self.config.get_history_dir())
+        return self.sampler
+
+    def _watch_panels(self):
+        """Wake panels when the files they show change instead of polling them every tick"""
+        self.watcher = create_watcher(asyncio.get_running_loop())
+        for entry in self.panels:
+            self._watch_panel(entry)
+        
+        # The config file itself is watched for hot reloads
+        try:
+            self.watcher.watch(self.config.config_path, self._config_changed)
+        except OSError:
+            pass
+
+    def _watch_panel(self, entry: PanelEntry):
+        """Wake a panel when its files change, if it shows any"""
+        if self.watcher is None:
+            return
+        watch_paths = getattr(entry.panel, 'watch_paths', None)
+        paths = watch_paths() if watch_paths is not None else []
+        if not paths:
+            return
+        
+        interval = self.scheduler.interval(entry.id)
+        callback = lambda entry=entry: self._wake_panel(entry)
+        try:
+            for path in paths:
+                self.watcher.watch(path, callback, interval)
+        except OSError:
+            # Directory missing or out of watches: keep polling this panel
+            self.watcher.unwatch(callback)
+            return
+        
+        # Events do the work now; the tick is only a safety net
+        self._watch_callbacks[entry.id] = callback
+        self.scheduler.set_interval(entry.id, max(interval, WATCHED_REFRESH_INTERVAL))
+
+    def _unwatch_panel(self, entry: PanelEntry):
+        """Stop waking a panel on file changes"""
+        callback = self._watch_callbacks.pop(entry.id, None)
+        if callback is not None and self.watcher is not None:
+            self.watcher.unwatch(callback)
+
+    def _wake_panel(self, entry: PanelEntry):
+        """Refresh a panel because its file changed, at most once per its refresh_interval"""
+        if entry.state.refreshing:
+            # Woken again when the running refresh finishes, so the write isn't missed
+            entry.state.wake_pending = True
+            return
+        
+        # Only a moved deadline needs the main loop to look again
+        if self._schedule_wake(entry) and self._wake is not None:
+            self._wake.set()
+
+    def _schedule_wake(self, entry: PanelEntry) -> bool:
+        """Make a woken panel due, no sooner than its refresh_interval after its last refresh"""
+        # A busy file coalesces into one refresh per interval instead of one per write
+        min_gap = entry.config.get('refresh_interval', self.refresh_rate)
+        return self.scheduler.wake(entry.id, max(float(min_gap), MIN_REFRESH_INTERVAL))
+
+    def _config_changed(self):
+        """Reload the config once it stops changing"""
+        self._reload_due = time.monotonic() + CONFIG_RELOAD_DELAY
+        if self._wake is not None:
+            self._wake.set()
+
+    def _reload_config(self) -> bool:
+        """Apply an edited config to the running dashboard, returning whether the layout must be rebuilt
+
+        Panels are matched up by id. Unchanged panels are left alone, panels
+        whose changes are only to scheduling or placement keep their panel
+        object, and other changes are applied in place by panels that
+        support it (`reconfigure`). Only new panels and panels that can't
+        take the change are constructed, so history and log offsets survive.
+        """
+        path = self.config.config_path
+        if not os.path.exists(path):
+            # Mid-save by an editor that replaces the file; its next event reloads
+            return False
+        
+        config = Config(path)
+        problems = [config.load_error] if config.load_error else config.get_problems()
+        if problems:
+            self._reload_message = f"⚠ Config not reloaded: {problems[0].splitlines()[0]}"
+            self.scheduler.wake(HEADER_KEY)
+            return False
+        
+        self._reload_message = ""
+        return self._apply_config(config)
+
+    def _apply_config(self, config: Config) -> bool:
+        """Switch the running panels over to a new config, returning whether the layout must be rebuilt"""
+        self.config = config
+        self.scheduler.wake(HEADER_KEY)
+        self.refresh_rate = config.get_refresh_rate()
+        self.scheduler.default_interval = self.refresh_rate
+        self.scheduler.set_interval(HEADER_KEY, self.refresh_rate)
+        
+        old_entries = {entry.id: entry for entry in self.panels}
+        entries = []
+        for index, (panel_id, panel_config) in enumerate(config.get_panel_entries()):
+            entry = old_entries.pop(panel_id, None)
+            if entry is not None and not self._update_entry(entry, panel_config):
+                self._remove_entry(entry)
+                entry = None
+            if entry is None:
+                entry = PanelEntry(panel_id, index, panel_config, self._create_panel(panel_config))
+                self.scheduler.add(panel_id, panel_config.get('refresh_interval', self.refresh_rate))
+                self._watch_panel(entry)
+            entry.index = index
+            entries.append(entry)
+        
+        for entry in old_entries.values():
+            self._remove_entry(entry)
+        self.panels.replace(entries)
+        
+        placement = self._get_placement()
+        if placement == self._placement:
+            return False
+        self._placement = placement
+        return True
+
+    def _update_entry(self, entry: PanelEntry, panel_config: Dict[str, Any]) -> bool:
+        """Bring a running panel up to date with its new config, or return False if it must be rebuilt"""
+        if panel_config != entry.config:
+            changed = {key for key in set(panel_config) | set(entry.config)
+                       if panel_config.get(key) != entry.config.get(key)}
+            if changed - set(ENTRY_KEYS):
+                # Reconfiguring while a fetch runs on the old config would race it
+                reconfigure = getattr(entry.panel, 'reconfigure', None)
+                if (reconfigure is None or entry.state.refreshing
+                        or (entry.future is not None and not entry.future.done())
+                        or not reconfigure(panel_config)):
+                    return False
+                self.scheduler.wake(entry.id)
+            elif getattr(entry.panel, 'config', None) is entry.config:
+                entry.panel.config = panel_config
+            entry.config = panel_config
+        
+        interval = panel_config.get('refresh_interval', self.refresh_rate)
+        if entry.id in self._watch_callbacks:
+            interval = max(interval, WATCHED_REFRESH_INTERVAL)
+        self.scheduler.set_interval(entry.id, interval)
+        return True
+
+    def _remove_entry(self, entry: PanelEntry):
+        """Stop refreshing a panel and let go of its files"""
+        if entry.state.refreshing:
+            entry.state.task.cancel()
+        self._unwatch_panel(entry)
+        self.scheduler.remove(entry.id)
+        close = getattr(entry.panel, 'close', None)
+        if close is not None:
+            close()
+
+    def _get_placement(self) -> tuple:
+        """Get everything the layout plan is compiled from, to tell whether a reload moved anything"""
+        return (
+            tuple((entry.id, tuple(entry.config.get(key) for key in PLACEMENT_KEYS)) for entry in self.panels),
+            repr(self.config.get_layout_config())
+        )
+
+    def _create_layout_plan(self) -> LayoutPlan:
+        """Compile the configured panel positions into a layout plan for the current terminal"""
+        return LayoutPlan(
+            [(entry.id, entry.config) for entry in self.panels],
+            self.config.get_layout_config(),
+            self.console.size.width
+        )
+
+    async def _fetch_panel(self, entry: PanelEntry) -> Dict[str, Any]:
+        """Fetch data for one panel, raising asyncio.TimeoutError if it misses its deadline"""
+        default_executor = 'inline' if entry.type in INLINE_PANEL_TYPES else 'thread'
+        if entry.config.get('executor', default_executor) == 'inline':
+            return entry.panel.fetch_data()
+        
+        # A previous fetch that is still stuck (hung NFS mount, slow sensor)
+        # keeps its worker; don't pile more work up behind it
+        if entry.future is not None and not entry.future.done():
+            raise asyncio.TimeoutError()
+        
+        entry.future = self.executor.submit(entry.panel.fetch_data)
+        timeout = entry.config.get('timeout', DEFAULT_FETCH_TIMEOUT)
+        return await asyncio.wait_for(asyncio.wrap_future(entry.future), timeout)
+
+    async def _refresh_panel(self, entry: PanelEntry):
+        """Fetch new data for a panel in the background and store it as its snapshot"""
+        state = entry.state
+        
+        try:
+            data = await self._fetch_panel(entry)
+        except asyncio.TimeoutError:
+            timeout = entry.config.get('timeout', DEFAULT_FETCH_TIMEOUT)
+            state.fail(f"fetch did not finish within {timeout}s")
+        except Exception as e:
+            state.fail(str(e))
         else:
-            # Default multi-panel layout: top, middle (left/right)
-            num_panels = len(panel_configs)
-            if num_panels == 1:
-                return "main"
-            elif num_panels == 2:
-                return ["left", "right"][panel_index % 2]
+            if isinstance(data, dict) and 'error' in data:
+                state.fail(str(data['error']), data)
             else:
-                # Map to: top, left, right for 3+ panels
-                return ["top", "left", "right"][panel_index % 3]
+                state.update(data)
+        
+        # The file changed while fetching, or a compressed file isn't worked
+        # through yet; either way the watched 30s interval is too long to wait
+        if state.wake_pending or getattr(entry.panel, 'catching_up', False):
+            state.wake_pending = False
+            self._schedule_wake(entry)
+        
+        # Let the main loop draw the new snapshot right away
+        if self._wake is not None:
+            self._wake.set()
 
-    def _render_plugin_panel(self, plugin_name: str, config: Dict[str, Any]) -> Panel:
-        """Render a plugin panel"""
+    def _render_panel(self, entry: PanelEntry):
+        """Render a panel from its last snapshot and place it in the layout"""
+        panel_type = entry.type
+        state = entry.state
+        
         try:
-            plugin = self.plugin_manager.load_plugin(plugin_name)
-            if not plugin:
-                return Panel(f"[red]Plugin '{plugin_name}' not found[/red]", 
-                           title="[bold red]Plugin Error[/bold red]")
-            
-            # Fetch data from plugin
-            if hasattr(plugin, 'fetch'):
-                data = plugin.fetch()
-            else:
-                data = {}
-            
-            # Render data
-            if hasattr(plugin, 'render'):
-                content = plugin.render(data)
+            if entry.panel is None:
+                panel = Panel(f"[red]Unknown panel type: {panel_type}[/red]", 
+                            title="[bold red]Error[/bold red]")
+            elif state.data is None and state.error:
+                panel = Panel(f"[yellow]⏳ No data yet: {state.error}[/yellow]", 
+                            title=f"[bold yellow]{entry.id} - Stale[/bold yellow]",
+                            border_style="yellow")
+            elif state.data is None:
+                panel = Panel("[dim italic]Loading...[/dim italic]", 
+                            title=f"[bold]{entry.id}[/bold]", border_style="dim")
             else:
-                content = str(data)
-            
-            return Panel(content, title=f"[bold green]{plugin_name}[/bold green]", 
-                        border_style="green")
-            
+                panel = entry.panel.render(state.data)
+                if state.age_label and isinstance(panel, Panel) and isinstance(panel.title, str):
+                    panel.title += state.age_label
         except Exception as e:
-            return Panel(f"[red]Plugin error: {str(e)}[/red]", 
-                        title="[bold red]Plugin Error[/bold red]")
+            panel = Panel(f"[red]Error in {entry.id} panel: {str(e)}[/red]", 
+                        title="[bold red]Panel Error[/bold red]")
+        
+        self.layout_plan.nodes[entry.id].update(panel)
+
+    def _age_label(self, entry: PanelEntry, now: float) -> str:
+        """Get the title suffix showing the snapshot age once its data is overdue or failed"""
+        state = entry.state
+        age = state.age(now)
+        if age is None:
+            return ""
+        
+        if state.error:
+            return f" [yellow]⚠ {self._format_age(age)} old[/yellow]"
+        elif age > 2 * self.scheduler.interval(entry.id):
+            return f" [dim]⏳ {self._format_age(age)} old[/dim]"
+        return ""
+
+    def _format_age(self, seconds: float) -> str:
+        """Format a snapshot age compactly"""
+        if seconds < 60:
+            return f"{seconds:.0f}s"
+        elif seconds < 3600:
+            return f"{seconds // 60:.0f}m"
+        else:
+            return f"{seconds // 3600:.0f}h"
+
+    async def _wait_for_next_frame(self):
+        """Sleep until the next panel is due or a background refresh finishes"""
+        deadline = self.scheduler.next_deadline()
+        if self._reload_due is not None:
+            deadline = min(deadline, self._reload_due)
+        delay = max(0.0, deadline - time.monotonic())
+        try:
+            await asyncio.wait_for(self._wake.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
 
     def _create_header(self) -> Panel:
         """Create header with dashboard title and time"""
@@ -279,6 +570,9 @@ class Dashboard:
         header_text.append(f"{current_time}", style="bold white")
         header_text.append(" | ", style="dim")
         header_text.append("Press Ctrl+C to quit", style="yellow")
+        if self._reload_message:
+            header_text.append(" | ", style="dim")
+            header_text.append(self._reload_message, style="bold red")
         
         return Panel(Align.center(header_text), height=3, border_style="blue")
 
@@ -291,30 +585,30 @@ class Dashboard:
         # Show banner
         self.banner.show()
         
-        # Create main layout with header
-        main_layout = Layout()
-        main_layout.split_column(
-            Layout(name="header", size=3),
-            Layout(name="content")
-        )
-        
-        # Create content layout for panels
-        content_layout = self._create_layout()
-        main_layout["content"].update(content_layout)
-        
+        main_layout = self._create_main_layout()
         self.running = True
+        self.scheduler.add(HEADER_KEY, self.refresh_rate)
+        self._wake = asyncio.Event()
+        self._watch_panels()
         
-        with Live(main_layout, console=self.console, refresh_per_second=2) as live:
+        # Repaint only when something changed instead of on a fixed timer
+        with Live(main_layout, console=self.console, auto_refresh=False) as live:
             try:
                 while self.running:
-                    # Update header
-                    main_layout["header"].update(self._create_header())
+                    now = time.monotonic()
+                    
+                    # Apply an edited config without restarting; the grid is only
+                    # recompiled when panels were added, removed or moved
+                    rebuild = False
+                    if self._reload_due is not None and now >= self._reload_due:
+                        self._reload_due = None
+                        rebuild = self._reload_config()
                     
-                    # Update all panels
-                    self._update_layout(content_layout)
+                    due = self._start_due_refreshes(now)
+                    if self._draw_frame(main_layout, now, HEADER_KEY in due, rebuild):
+                        live.refresh()
                     
-                    # Wait for next refresh
-                    await asyncio.sleep(self.refresh_rate)
+                    await self._wait_for_next_frame()
                     
             except KeyboardInterrupt:
                 self.running = False
@@ -322,8 +616,85 @@ class Dashboard:
                 self.console.print(f"[red]Dashboard error: {str(e)}[/red]")
                 self.running = False
         
+        self._shutdown()
         self.console.print("[green]Dashboard stopped.[/green]")
 
+    def _create_main_layout(self) -> Layout:
+        """Create the main layout: the header above the compiled panel grid"""
+        main_layout = Layout()
+        main_layout.split_column(
+            Layout(name="header", size=3),
+            Layout(name="content")
+        )
+        
+        # Compile the panel grid once; it's only rebuilt on resize or reload
+        self.layout_plan = self._create_layout_plan()
+        main_layout["content"].update(self.layout_plan.root)
+        return main_layout
+
+    def _start_due_refreshes(self, now: float) -> List[str]:
+        """Advance the deadlines that have passed and start refreshing the panels that are due"""
+        # Only touch the panels whose own interval has elapsed
+        due = self.scheduler.due(now)
+        for panel_id in due:
+            self.scheduler.advance(panel_id, now)
+        
+        # Panels due together share one reading of each metric
+        if self.sampler is not None and len(due) > (HEADER_KEY in due):
+            self.sampler.begin_tick()
+        
+        # Refreshes run in the background; a panel whose last refresh
+        # is still in flight just skips this turn
+        for panel_id in due:
+            entry = self.panels.get(panel_id)
+            if entry is not None and entry.panel is not None and not entry.state.refreshing:
+                entry.state.task = asyncio.ensure_future(self._refresh_panel(entry))
+        return due
+
+    def _draw_frame(self, main_layout: Layout, now: float, header_due: bool, rebuild: bool = False) -> bool:
+        """Redraw whatever changed since the last frame, returning whether anything did"""
+        changed = False
+        
+        # Narrowing or widening the terminal can change which rows stack
+        if rebuild or not self.layout_plan.fits(self.console.size.width):
+            self.layout_plan = self._create_layout_plan()
+            main_layout["content"].update(self.layout_plan.root)
+            for entry in self.panels:
+                entry.state.dirty = True
+        
+        if header_due:
+            main_layout["header"].update(self._create_header())
+            changed = True
+        
+        # Frames draw from the last good snapshots, so frame time doesn't
+        # depend on how slow the data sources are; panels whose snapshot
+        # and age label are unchanged keep their previous rendering
+        for entry in self.panels:
+            state = entry.state
+            age_label = self._age_label(entry, now)
+            if age_label != state.age_label:
+                state.age_label = age_label
+                state.dirty = True
+            if state.dirty:
+                self._render_panel(entry)
+                state.dirty = False
+                changed = True
+        return changed
+
+    def _shutdown(self):
+        """Stop background refreshes and watches and flush history"""
+        for entry in self.panels:
+            if entry.state.refreshing:
+                entry.state.task.cancel()
+        
+        if self.watcher is not None:
+            self.watcher.close()
+        
+        # Don't wait on fetches that may be stuck in I/O
+        self.executor.shutdown(wait=False)
+        if self.sampler is not None:
+            self.sampler.history_store.flush()
+
     def start(self):
         """Start the dashboard (blocking)"""
         try:
@@ -0,0 +1,133 @@
+"""
+Figlet rendering for dashtrash - fonts loaded once, text composed from cached glyphs
+"""
+
+import threading
+from typing import List, Tuple
+
+import pyfiglet
+
+
+# Font used when the requested one can't be loaded
+FALLBACK_FONT = 'standard'
+
+# Everything a clock can show, pre-rendered when a cache is created for one
+CLOCK_GLYPHS = '0123456789: APM'
+
+
+class GlyphCache:
+    """Renders text in one figlet font, the same as pyfiglet, without redoing the work per call
+
+    pyfiglet.figlet_format loads and parses the font file on every call.
+    Here the font is loaded once, and the text is composed glyph by glyph
+    with the font's own smushing rules. How a glyph joins onto what is
+    already rendered depends only on the last `width` columns of each
+    row, so each join is computed once and replayed from a dict after
+    that; a clock redrawn every second re-renders from a handful of joins.
+
+    Joining uses pyfiglet's builder internals, which aren't a public API;
+    if they don't behave as expected, the cache falls back to plain
+    pyfiglet rendering for good.
+    """
+
+    def __init__(self, font: str, preload: str = ''):
+        self.figlet = _load_figlet(font)
+        self.font = self.figlet.font
+        self._font = self.figlet.Font
+        self._joins = {}
+        # Right-to-left fonts and wrapped lines take the plain pyfiglet path
+        self._composable = self.figlet.direction == 'left-to-right'
+        try:
+            self._hard_blank = self._font.hardBlank
+            self._height = self._font.height
+        except AttributeError:
+            self._composable = False
+        if preload:
+            self.render(preload)
+            for first in preload:
+                for second in preload:
+                    self.render(first + second)
+
+    def render(self, text: str) -> str:
+        """Render text as figlet art, exactly as pyfiglet.figlet_format would"""
+        if not self._composable or '\n' in text:
+            return self.figlet.renderText(text)
+        try:
+            return self._compose(text)
+        except Exception:
+            # A pyfiglet whose internals differ from the ones composing relies on
+            self._composable = False
+            return self.figlet.renderText(text)
+
+    def _compose(self, text: str) -> str:
+        """Render text glyph by glyph from the cached joins"""
+        rows = [''] * self._height
+        previous_width = 0
+        chars = self._font.chars
+        widths = self._font.width
+        for char in text:
+            code = ord(char)
+            glyph = chars.get(code)
+            if glyph is None:
+                # Figlet skips characters the font doesn't have
+                continue
+            width = widths[code]
+            tails = tuple(row[-width:] if width else '' for row in rows)
+            key = (tails, code, previous_width)
+            joined = self._joins.get(key)
+            if joined is None:
+                joined = self._join(tails, glyph, width, previous_width)
+                self._joins[key] = joined
+            cut = len(tails[0])
+            rows = [row[:len(row) - cut] + tail for row, tail in zip(rows, joined)]
+            previous_width = width
+
+        if len(rows[0]) >= self.figlet.width:
+            # Wider than a line: let pyfiglet wrap it
+            return self.figlet.renderText(text)
+        return '\n'.join(rows).replace(self._hard_blank, ' ') + '\n'
+
+    def _join(self, tails: Tuple[str, ...], glyph: List[str], width: int, previous_width: int) -> List[str]:
+        """Smush a glyph onto the right edge of the rendered rows, using pyfiglet's own rules"""
+        builder = pyfiglet.FigletBuilder('', self._font, 'left-to-right', self.figlet.width, 'left')
+        builder.buffer = list(tails)
+        builder.prevCharWidth = previous_width
+        builder.curCharWidth = width
+        builder.maxSmush = builder.smushAmount(builder.buffer, glyph)
+        for row in range(self._height):
+            builder.addCurCharRowToBufferRow(glyph, row)
+        return builder.buffer
+
+
+_figlets = {}
+_caches = {}
+_cache_lock = threading.Lock()
+
+
+def _load_figlet(font: str) -> pyfiglet.Figlet:
+    """Load a font once, falling back to the standard font (also only tried once) if it can't be"""
+    figlet = _figlets.get(font)
+    if figlet is None:
+        try:
+            figlet = pyfiglet.Figlet(font=font)
+        except Exception:
+            if font == FALLBACK_FONT:
+                raise
+            figlet = _load_figlet(FALLBACK_FONT)
+        _figlets[font] = figlet
+    return figlet
+
+
+def get_glyph_cache(font: str, preload: str = '') -> GlyphCache:
+    """Get the process-wide glyph cache of a font"""
+    with _cache_lock:
+        cache = _caches.get(font)
+        if cache is None:
+            cache = GlyphCache(font, preload)
+            _caches[font] = cache
+        return cache
+
+
+def render(text: str, font: str = FALLBACK_FONT) -> str:
+    """Render text in a font through its shared glyph cache"""
+    return get_glyph_cache(font).render(text)
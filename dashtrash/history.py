@@ -0,0 +1,264 @@
+"""
+History module for dashtrash - fixed-size metric history with time-bucketed rollups
+"""
+
+import mmap
+import os
+import struct
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# Raw samples kept per metric (two minutes at a 1s refresh)
+DEFAULT_RAW_CAPACITY = 120
+
+# Rollup tiers: name, bucket length in seconds, number of buckets kept
+ROLLUP_TIERS = (
+    ('minute', 60, 24 * 60),
+    ('hour', 3600, 7 * 24),
+)
+
+RESOLUTIONS = ('raw',) + tuple(name for name, _, _ in ROLLUP_TIERS)
+
+# History file header: magic, raw capacity, size of the data that follows
+FILE_HEADER = struct.Struct('<8sQQ')
+FILE_MAGIC = b'DTHIST01'
+
+
+class RingBuffer:
+    """A fixed-size ring of floats with zero-copy views of the newest values
+
+    Every value is written twice, at i and i + capacity, so the newest n values
+    are always one contiguous slice of the buffer and can be handed out as a
+    memoryview without copying. The write cursor and count live in a small
+    header at the start of the buffer, so a ring laid over an mmap'd file is
+    persisted entirely by memory stores.
+    """
+
+    HEADER_SIZE = 16
+
+    def __init__(self, capacity: int, buffer: Optional[memoryview] = None):
+        self.capacity = capacity
+        if buffer is None:
+            buffer = memoryview(bytearray(self.nbytes(capacity)))
+        self._header = buffer[:self.HEADER_SIZE].cast('Q')
+        self._view = buffer[self.HEADER_SIZE:self.nbytes(capacity)].cast('d')
+        
+        # A header that doesn't fit this ring is from a damaged file; start over
+        if self._header[0] >= capacity or self._header[1] > capacity:
+            self._header[0] = self._header[1] = 0
+
+    @classmethod
+    def nbytes(cls, capacity: int) -> int:
+        """Get the buffer size needed for a ring of this capacity"""
+        return cls.HEADER_SIZE + 2 * capacity * 8
+
+    def append(self, value: float):
+        """Add a value, overwriting the oldest one once the ring is full"""
+        cursor = self._header[0]
+        self._view[cursor] = value
+        self._view[cursor + self.capacity] = value
+        self._header[0] = (cursor + 1) % self.capacity
+        if self._header[1] < self.capacity:
+            self._header[1] += 1
+
+    def view(self, n: Optional[int] = None) -> memoryview:
+        """Get the newest n values (all by default), oldest first, without copying"""
+        count = self._header[1]
+        if n is None or n > count:
+            n = count
+        end = self._header[0] + self.capacity
+        return self._view[end - n:end]
+
+    def latest(self) -> Optional[float]:
+        """Get the newest value"""
+        if not self._header[1]:
+            return None
+        return self._view[self._header[0] + self.capacity - 1]
+
+    def __len__(self) -> int:
+        return self._header[1]
+
+
+class Rollup:
+    """Aggregates samples into fixed time buckets of min/avg/max
+
+    The open bucket's running aggregate is kept in the buffer as well, so a
+    restart within a bucket continues it instead of splitting it in two.
+    """
+
+    STATE_SIZE = 5 * 8
+    STATS = ('min', 'avg', 'max')
+
+    def __init__(self, seconds: int, capacity: int, buffer: Optional[memoryview] = None):
+        self.seconds = seconds
+        if buffer is None:
+            buffer = memoryview(bytearray(self.nbytes(capacity)))
+        
+        # bucket, count, sum, low, high of the bucket being filled
+        self._state = buffer[:self.STATE_SIZE].cast('d')
+        ring_size = RingBuffer.nbytes(capacity)
+        offset = self.STATE_SIZE
+        self.stats = {}
+        for stat in self.STATS:
+            self.stats[stat] = RingBuffer(capacity, buffer[offset:offset + ring_size])
+            offset += ring_size
+
+    @classmethod
+    def nbytes(cls, capacity: int) -> int:
+        """Get the buffer size needed for a rollup of this capacity"""
+        return cls.STATE_SIZE + len(cls.STATS) * RingBuffer.nbytes(capacity)
+
+    def add(self, value: float, timestamp: float):
+        """Add a sample, closing the current bucket when the sample starts a new one"""
+        state = self._state
+        bucket = timestamp // self.seconds
+        if bucket != state[0]:
+            self._close_bucket()
+            state[0] = bucket
+
+        if state[1]:
+            state[3] = min(state[3], value)
+            state[4] = max(state[4], value)
+        else:
+            state[3] = state[4] = value
+        state[2] += value
+        state[1] += 1
+
+    def _close_bucket(self):
+        """Push the aggregate of the current bucket into the rings"""
+        state = self._state
+        if not state[1]:
+            return
+        self.stats['min'].append(state[3])
+        self.stats['avg'].append(state[2] / state[1])
+        self.stats['max'].append(state[4])
+        state[1] = 0
+        state[2] = 0.0
+
+    def view(self, stat: str = 'avg', n: Optional[int] = None) -> memoryview:
+        """Get the newest n closed buckets of one statistic"""
+        return self.stats[stat].view(n)
+
+
+class TieredHistory:
+    """History of one metric: raw samples plus minute and hour rollups
+
+    A day of history at minute resolution is 1440 buckets per statistic
+    instead of 86400 raw floats, and every read is a memoryview into the
+    ring rather than a copy.
+    """
+
+    def __init__(self, raw_capacity: int = DEFAULT_RAW_CAPACITY, buffer: Optional[memoryview] = None):
+        if buffer is None:
+            buffer = memoryview(bytearray(self.nbytes(raw_capacity)))
+        
+        offset = RingBuffer.nbytes(raw_capacity)
+        self.raw = RingBuffer(raw_capacity, buffer[:offset])
+        self.rollups = {}
+        for name, seconds, capacity in ROLLUP_TIERS:
+            size = Rollup.nbytes(capacity)
+            self.rollups[name] = Rollup(seconds, capacity, buffer[offset:offset + size])
+            offset += size
+
+    @classmethod
+    def nbytes(cls, raw_capacity: int = DEFAULT_RAW_CAPACITY) -> int:
+        """Get the buffer size needed for a history with this many raw samples"""
+        return RingBuffer.nbytes(raw_capacity) + sum(
+            Rollup.nbytes(capacity) for _, _, capacity in ROLLUP_TIERS
+        )
+
+    def append(self, value: float, timestamp: Optional[float] = None):
+        """Record a sample in the raw ring and every rollup"""
+        if timestamp is None:
+            timestamp = time.time()
+        self.raw.append(value)
+        for rollup in self.rollups.values():
+            rollup.add(value, timestamp)
+
+    def view(self, resolution: str = 'raw', n: Optional[int] = None, stat: str = 'avg') -> memoryview:
+        """Get the newest n points at a resolution ('raw', 'minute' or 'hour')"""
+        if resolution in self.rollups:
+            return self.rollups[resolution].view(stat, n)
+        return self.raw.view(n)
+
+    def latest(self) -> Optional[float]:
+        """Get the newest raw sample"""
+        return self.raw.latest()
+
+
+class HistoryStore:
+    """Named metric histories, created on first use
+
+    Without a directory histories live in process memory. With one, each
+    metric is a fixed-size file mapped into memory, so history survives
+    restarts and recording a sample is a memory store rather than a write.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = os.path.expanduser(directory) if directory else None
+        self._series = {}
+        self._maps = []
+
+    def series(self, name: str) -> TieredHistory:
+        """Get the history of a metric"""
+        history = self._series.get(name)
+        if history is None:
+            history = self._series[name] = self._open(name)
+        return history
+
+    def _open(self, name: str) -> TieredHistory:
+        """Create a metric's history, backed by its history file if possible"""
+        if not self.directory:
+            return TieredHistory()
+        
+        try:
+            return self._open_mapped(os.path.join(self.directory, f"{name}.hist"))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not open history file for '{name}': {e}")
+            return TieredHistory()
+
+    def _open_mapped(self, path: str) -> TieredHistory:
+        """Map a history file, (re)initializing it if it doesn't match the current layout"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data_size = TieredHistory.nbytes()
+        file_size = FILE_HEADER.size + data_size
+        
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                # Two dashboards writing one ring would interleave cursors
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    raise OSError("history file is in use by another dashtrash")
+            
+            header = os.read(fd, FILE_HEADER.size)
+            expected = FILE_HEADER.pack(FILE_MAGIC, DEFAULT_RAW_CAPACITY, data_size)
+            if header != expected or os.fstat(fd).st_size != file_size:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, file_size)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, expected)
+            
+            mapped = mmap.mmap(fd, file_size)
+        except Exception:
+            os.close(fd)
+            raise
+        
+        # The descriptor stays open to hold the lock for the life of the process
+        self._maps.append((fd, mapped))
+        return TieredHistory(buffer=memoryview(mapped)[FILE_HEADER.size:])
+
+    def flush(self):
+        """Ask the OS to write mapped histories back to disk"""
+        for _, mapped in self._maps:
+            try:
+                mapped.flush()
+            except (OSError, ValueError):
+                pass
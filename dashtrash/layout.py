@@ -0,0 +1,107 @@
+"""
+Layout module for dashtrash - compiles panel positions into a grid of Rich layouts
+"""
+
+from typing import Dict, Any, List, Tuple
+from rich.layout import Layout
+
+
+# Named positions are shorthand for grid cells: (row, column)
+POSITION_CELLS = {
+    'top': (0, 0),
+    'main': (0, 0),
+    'left': (1, 0),
+    'right': (1, 1),
+    'bottom': (2, 0),
+}
+
+# Rows narrower than this per panel are stacked vertically instead of side by side
+DEFAULT_MIN_COLUMN_WIDTH = 40
+
+
+class LayoutPlan:
+    """A grid layout compiled once from the panel configs
+
+    Panels are placed by `row`/`column` (or a named `position`) and a row's
+    panels share its width in proportion to their `span`. Rows are sized by
+    the `rows` ratios of the top-level `layout` config. The plan maps each
+    panel key straight to its Layout node, so placing a panel every frame
+    is a dictionary lookup.
+    """
+
+    def __init__(self, panels: List[Tuple[str, Dict[str, Any]]],
+                 layout_config: Dict[str, Any] = None, width: int = 0):
+        self.layout_config = layout_config or {}
+        self.min_column_width = self.layout_config.get('min_column_width', DEFAULT_MIN_COLUMN_WIDTH)
+        self.rows = self._build_grid(panels)
+        self.stacked = self._stacking(width)
+        self.root = Layout(name="content")
+        self.nodes = {}
+        self._compile()
+
+    def _build_grid(self, panels: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[int, List[Tuple[str, int]]]]:
+        """Group panels into ordered rows of (key, span) cells"""
+        cells = {}
+        unplaced = []
+
+        for order, (key, panel_config) in enumerate(panels):
+            position = panel_config.get('position')
+            if 'row' in panel_config:
+                row = int(panel_config['row'])
+                column = int(panel_config.get('column', 0))
+            elif position in POSITION_CELLS:
+                row, column = POSITION_CELLS[position]
+            else:
+                unplaced.append((key, panel_config))
+                continue
+            span = max(1, int(panel_config.get('span', 1)))
+            cells.setdefault(row, []).append((column, order, key, span))
+
+        # Panels without a position share one row below everything else
+        if unplaced:
+            last_row = max(cells) + 1 if cells else 0
+            for order, (key, panel_config) in enumerate(unplaced):
+                span = max(1, int(panel_config.get('span', 1)))
+                cells.setdefault(last_row, []).append((0, order, key, span))
+
+        return [
+            (row, [(key, span) for _, _, key, span in sorted(cells[row])])
+            for row in sorted(cells)
+        ]
+
+    def _stacking(self, width: int) -> Tuple[bool, ...]:
+        """Decide per row whether its panels are too narrow to sit side by side"""
+        if not width or not self.min_column_width:
+            return tuple(False for _ in self.rows)
+        return tuple(
+            len(cells) > 1 and width / len(cells) < self.min_column_width
+            for _, cells in self.rows
+        )
+
+    def _compile(self):
+        """Build the Layout tree and the key to node map"""
+        row_ratios = self.layout_config.get('rows', [])
+        row_layouts = []
+
+        for (row, cells), stacked in zip(self.rows, self.stacked):
+            ratio = row_ratios[row] if row < len(row_ratios) else 1
+            row_layout = Layout(name=f"row_{row}", ratio=ratio)
+
+            cell_layouts = []
+            for key, span in cells:
+                node = Layout(name=key, ratio=span)
+                self.nodes[key] = node
+                cell_layouts.append(node)
+
+            if stacked:
+                row_layout.split_column(*cell_layouts)
+            else:
+                row_layout.split_row(*cell_layouts)
+            row_layouts.append(row_layout)
+
+        if row_layouts:
+            self.root.split_column(*row_layouts)
+
+    def fits(self, width: int) -> bool:
+        """Check whether the plan compiled for another width is still valid at this one"""
+        return self._stacking(width) == self.stacked
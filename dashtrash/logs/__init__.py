@@ -0,0 +1,18 @@
+"""
+Log reading package for dashtrash - tailing, filtering and parsing log files for the log panels
+"""
+
+from .tail import TailReader
+from .matcher import LogMatcher
+from .merge import MultiTail
+from .timestamps import TimestampParser
+from .timeindex import OffsetIndex
+from .compressed import CompressedTail, open_tail
+from .structured import JsonLineParser
+from .dedup import LineDeduper
+from .rates import RateCounter
+from .sketch import QuantileSketch, SlidingSketch
+
+__all__ = ['TailReader', 'LogMatcher', 'MultiTail', 'TimestampParser', 'OffsetIndex',
+           'CompressedTail', 'open_tail', 'JsonLineParser', 'LineDeduper',
+           'RateCounter', 'QuantileSketch', 'SlidingSketch']
@@ -0,0 +1,322 @@
+"""
+Compressed log reading for dashtrash - streams rotated .gz/.bz2/.xz/.zst logs without inflating them
+"""
+
+import os
+import threading
+import zlib
+from collections import OrderedDict, deque
+from typing import Any, Iterator, List, Optional
+
+from .tail import TailReader, DEFAULT_MAX_BYTES, MAX_LINE_BYTES
+
+try:
+    import bz2
+except ImportError:  # Python built without bzip2
+    bz2 = None
+
+try:
+    import lzma
+except ImportError:  # Python built without liblzma
+    lzma = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+
+# Compressed bytes read per step
+INPUT_CHUNK = 16 * 1024
+
+# Cap on the output of one decompression step, so a compression bomb can't
+# allocate more than this at once
+OUTPUT_CHUNK = 256 * 1024
+
+# Decompressor checkpoints kept, one per file
+CHECKPOINT_FILES = 32
+
+# Newest lines kept with a checkpoint, replayed to readers that resume from it
+CHECKPOINT_LINES = 200
+
+# Leading compressed bytes a checkpoint is checked against, so a new file
+# that got the old one's inode isn't resumed in the middle of its stream
+FINGERPRINT_BYTES = 4096
+
+
+def _gzip_decompressor():
+    """Create a decompressor for one gzip member"""
+    return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+
+def _zstd_decompressor():
+    """Create a decompressor for one zstd frame"""
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+# File suffix -> decompressor factory, or None if the codec isn't available here
+CODECS = {
+    '.gz': _gzip_decompressor,
+    '.bz2': bz2.BZ2Decompressor if bz2 else None,
+    '.xz': lzma.LZMADecompressor if lzma else None,
+    '.lzma': lzma.LZMADecompressor if lzma else None,
+    '.zst': _zstd_decompressor if zstandard else None,
+}
+
+_CODEC_PACKAGES = {'.bz2': 'bz2', '.xz': 'lzma', '.lzma': 'lzma', '.zst': 'zstandard'}
+
+
+def compression_suffix(path: str) -> Optional[str]:
+    """Get the compression suffix of a path (".gz", ...), or None for a plain file"""
+    suffix = os.path.splitext(path)[1].lower()
+    return suffix if suffix in CODECS else None
+
+
+def open_tail(path: str, initial_lines: int = 15, max_bytes: int = DEFAULT_MAX_BYTES, resume_key: Any = None):
+    """Create the right reader for a log file: streaming decompression for compressed ones"""
+    if compression_suffix(os.path.expanduser(path)):
+        return CompressedTail(path, initial_lines, max_bytes, resume_key)
+    return TailReader(path, initial_lines, max_bytes)
+
+
+class _Checkpoint:
+    """Where a file's decompression got to, so a later reader can carry on from there"""
+
+    def __init__(self, size: int, mtime: int, fingerprint: bytes, offset: int, decompressor,
+                 pending: bytes, partial: bytes, lines: deque):
+        self.size = size
+        self.mtime = mtime
+        self.fingerprint = fingerprint
+        self.offset = offset
+        self.decompressor = decompressor
+        self.pending = pending
+        self.partial = partial
+        self.lines = lines
+
+
+_checkpoints = OrderedDict()
+_checkpoints_lock = threading.Lock()
+
+
+class CompressedTail:
+    """Streams the lines of a compressed log file through a bounded decompressor
+
+    Unlike a plain tail, the end of a compressed file can only be reached by
+    decompressing everything before it, so every line is yielded (filters
+    see the whole file, not just its last lines) and each call decompresses
+    at most `max_bytes` of output; a big file is worked through over several
+    refreshes. Nothing but the current chunk is held in memory.
+
+    After each call the decompressor state is saved in a small process-wide
+    checkpoint cache keyed by `resume_key` and the file's device and inode,
+    and checked against its size, mtime and leading bytes. A reader created
+    later by the same consumer (a glob rescan after a rotation renamed the
+    file) resumes there instead of decompressing from byte 0, replaying its
+    last `initial_lines` lines. Other consumers filter differently and need
+    the whole stream, so by default a reader only resumes its own work.
+    """
+
+    def __init__(self, path: str, initial_lines: int = 15, max_bytes: int = DEFAULT_MAX_BYTES,
+                 resume_key: Any = None):
+        self.path = os.path.expanduser(path)
+        self.initial_lines = initial_lines
+        self.max_bytes = max_bytes
+        self.suffix = compression_suffix(self.path)
+        self.position = 0
+        self.skipped_bytes = 0
+        self.skipped_lines = 0
+        self._factory = CODECS.get(self.suffix)
+        self._resume_key = resume_key if resume_key is not None else object()
+        self._file = None
+        self._identity = None
+        self._fingerprint = b''
+        self._decompressor = None
+        self._pending = b''
+        self._partial = b''
+        self._recent = deque(maxlen=CHECKPOINT_LINES)
+        self._size = 0
+
+    def read_lines(self) -> List[str]:
+        """Get the lines decompressed since the last call"""
+        return list(self.iter_lines())
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield the next lines of the file, decompressing at most max_bytes"""
+        if self._factory is None:
+            package = _CODEC_PACKAGES.get(self.suffix, self.suffix)
+            raise RuntimeError(f"Can't read {self.suffix} files: {package} is not available")
+
+        if self._file is None or self._replaced():
+            if self._open() and self.initial_lines > 0:
+                yield from list(self._recent)[-self.initial_lines:]
+
+        stat = os.fstat(self._file.fileno())
+        if stat.st_size < self.position:
+            # Rewritten in place; nothing we decompressed is valid any more
+            self._restart()
+
+        # Output is pulled at most the remaining budget at a time; input the
+        # decompressor hasn't got to yet waits for the next call
+        budget = self.max_bytes
+        while budget > 0:
+            output = self._inflate(budget)
+            if output is None:
+                if self.position >= stat.st_size:
+                    break
+                self._file.seek(self.position)
+                data = self._file.read(min(INPUT_CHUNK, stat.st_size - self.position))
+                if not data:
+                    break
+                self.position += len(data)
+                self._pending = data
+                continue
+            budget -= len(output)
+            yield from self._split(output)
+
+        self._size = stat.st_size
+        self._save_checkpoint(stat)
+
+    def close(self):
+        """Close the file handle"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._identity = None
+
+    @property
+    def progress(self) -> float:
+        """Get the fraction of the compressed file decompressed so far"""
+        if not self._size:
+            return 1.0
+        return min(self.position / self._size, 1.0)
+
+    @property
+    def line_offset(self) -> int:
+        """Get the compressed offset reached (there are no seekable line offsets)"""
+        return self.position
+
+    @property
+    def identity(self) -> Optional[tuple]:
+        """Get the (device, inode) of the file being read"""
+        return self._identity
+
+    def _open(self) -> bool:
+        """Open the file, resuming from its checkpoint if it has a usable one; returns whether it did"""
+        self.close()
+        self._file = open(self.path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        self._fingerprint = self._file.read(FINGERPRINT_BYTES)
+        self._restart()
+
+        key = (self._resume_key, self._identity)
+        with _checkpoints_lock:
+            checkpoint = _checkpoints.get(key)
+            usable = checkpoint is not None and self._fingerprint.startswith(checkpoint.fingerprint) and (
+                (checkpoint.size, checkpoint.mtime) == (stat.st_size, stat.st_mtime_ns)
+                # Only appended to since: carry on from where it stopped
+                or (checkpoint.size < stat.st_size and checkpoint.mtime <= stat.st_mtime_ns)
+            )
+            if not usable:
+                return False
+            _checkpoints.move_to_end(key)
+            self.position = checkpoint.offset
+            self._decompressor = _copy(checkpoint.decompressor)
+            self._pending = checkpoint.pending
+            self._partial = checkpoint.partial
+            self._recent = deque(checkpoint.lines, maxlen=CHECKPOINT_LINES)
+            return True
+
+    def _restart(self):
+        """Start decompressing from the beginning of the file"""
+        self.position = 0
+        self._decompressor = None
+        self._pending = b''
+        self._partial = b''
+        self._recent = deque(maxlen=CHECKPOINT_LINES)
+
+    def _replaced(self) -> bool:
+        """Check whether the path now points at a different file"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self._identity
+
+    def _inflate(self, max_length: int) -> Optional[bytes]:
+        """Decompress at most max_length bytes of the pending input, or None once it needs more input"""
+        max_length = min(max_length, OUTPUT_CHUNK)
+        while True:
+            if self._decompressor is None:
+                if not self._pending:
+                    return None
+                self._decompressor = self._factory()
+            decompressor = self._decompressor
+
+            if hasattr(decompressor, 'unconsumed_tail'):
+                # zlib: the input it didn't get to is handed back in unconsumed_tail
+                output = decompressor.decompress(self._pending, max_length)
+                self._pending = decompressor.unconsumed_tail
+            elif hasattr(decompressor, 'needs_input'):
+                # bz2/lzma: the input it didn't get to is buffered internally
+                if decompressor.needs_input and not self._pending:
+                    return None
+                output = decompressor.decompress(self._pending, max_length)
+                self._pending = b''
+            else:
+                # zstd's streaming object can't cap its output; feed one chunk at a time
+                output = decompressor.decompress(self._pending)
+                self._pending = b''
+
+            if getattr(decompressor, 'eof', False):
+                # Concatenated members (gzip -c >> file.gz) each need a fresh decompressor;
+                # unused_data is all the input after the member (zlib repeats it in unconsumed_tail)
+                self._pending = decompressor.unused_data
+                self._decompressor = None
+            if output:
+                return output
+            if not self._pending and self._decompressor is not None:
+                return None
+
+    def _split(self, data: bytes) -> List[str]:
+        """Split decompressed bytes into complete lines, holding back a trailing partial line"""
+        if not data:
+            return []
+        pieces = (self._partial + data).split(b'\n')
+        self._partial = pieces.pop()
+        if len(self._partial) > MAX_LINE_BYTES:
+            pieces.append(self._partial)
+            self._partial = b''
+
+        lines = [piece.decode('utf-8', errors='ignore').rstrip('\r') for piece in pieces]
+        self._recent.extend(lines)
+        return lines
+
+    def _save_checkpoint(self, stat: os.stat_result):
+        """Remember how far decompression got, if the decompressor state can be kept"""
+        if self._decompressor is None:
+            decompressor = None
+        else:
+            # Only zlib can copy its state; other codecs are checkpointed between members
+            decompressor = _copy(self._decompressor)
+            if decompressor is None:
+                return
+
+        checkpoint = _Checkpoint(
+            stat.st_size, stat.st_mtime_ns, self._fingerprint[:stat.st_size], self.position, decompressor,
+            self._pending, self._partial, deque(self._recent, maxlen=CHECKPOINT_LINES)
+        )
+        key = (self._resume_key, self._identity)
+        with _checkpoints_lock:
+            _checkpoints[key] = checkpoint
+            _checkpoints.move_to_end(key)
+            while len(_checkpoints) > CHECKPOINT_FILES:
+                _checkpoints.popitem(last=False)
+
+
+def _copy(decompressor):
+    """Copy a decompressor's state, or None if it can't be copied"""
+    if decompressor is None:
+        return None
+    copy = getattr(decompressor, 'copy', None)
+    return copy() if copy is not None else None
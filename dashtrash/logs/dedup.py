@@ -0,0 +1,100 @@
+"""
+Repeated-line collapsing for dashtrash - folds log storms into one counted line
+"""
+
+import re
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import List, Optional, Tuple
+
+
+# Distinct lines remembered; the least recently seen is forgotten first
+DEFAULT_DEDUP_WINDOW = 1000
+
+# The parts of a line that differ between repeats of "the same" message:
+# every token with a digit in it, which covers numbers, UUIDs, hex ids
+# (0x7f3a, a6ff68b2), addresses and durations like 31ms. Masking whole
+# tokens is one cheap pass where separate UUID/hex/number patterns cost
+# twice as much per line.
+_VOLATILE = re.compile(r'\b[\w-]*\d[\w-]*')
+
+
+def normalize(line: str) -> str:
+    """Mask the volatile parts of a line so repeats of one message compare equal"""
+    return _VOLATILE.sub('#', line)
+
+
+class RepeatedLine:
+    """One distinct (normalized) line with how often and when it was seen"""
+
+    __slots__ = ('text', 'style', 'count', 'first_seen', 'last_seen')
+
+    def __init__(self, text: str, style: str, timestamp: float):
+        self.text = text
+        self.style = style
+        self.count = 1
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+
+    def display(self) -> str:
+        """Get the line as shown: the newest copy, prefixed with its count and time span"""
+        if self.count == 1:
+            return self.text
+        first = time.strftime('%H:%M:%S', time.localtime(self.first_seen))
+        last = time.strftime('%H:%M:%S', time.localtime(self.last_seen))
+        return f"×{self.count} [{first}→{last}] {self.text}"
+
+
+class LineDeduper:
+    """Counts repeats of normalized lines over a bounded LRU window
+
+    Lines are keyed by their normalized form, so "timeout after 31ms on
+    10.0.0.7" and "timeout after 29ms on 10.0.0.9" are one entry.
+    A repeat moves its entry to the newest end; once more than `window`
+    distinct lines have been seen the stalest one is dropped. During a storm
+    the panel shows one counted line instead of max_lines copies of it.
+    """
+
+    def __init__(self, window: int = DEFAULT_DEDUP_WINDOW):
+        self.window = max(1, int(window))
+        self._entries = OrderedDict()
+
+    def add(self, text: str, style: str, timestamp: Optional[float] = None):
+        """Count a line, keeping its newest copy as the text shown"""
+        if timestamp is None:
+            timestamp = time.time()
+        key = normalize(text)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = RepeatedLine(text, style, timestamp)
+            if len(self._entries) > self.window:
+                self._entries.popitem(last=False)
+            return
+
+        entry.count += 1
+        # Lines merged from several files can arrive out of order
+        if timestamp >= entry.last_seen:
+            entry.text = text
+            entry.style = style
+            entry.last_seen = timestamp
+        entry.first_seen = min(entry.first_seen, timestamp)
+        self._entries.move_to_end(key)
+
+    def newest(self, n: int, since: Optional[float] = None) -> List[RepeatedLine]:
+        """Get the n most recently seen lines, oldest first, optionally only those seen since a time"""
+        if since is not None:
+            # Entries are in last-seen order, so stale ones are at the front
+            while self._entries:
+                key, entry = next(iter(self._entries.items()))
+                if entry.last_seen >= since:
+                    break
+                del self._entries[key]
+        return list(islice(reversed(self._entries.values()), n))[::-1]
+
+    def lines(self, n: int, since: Optional[float] = None) -> List[Tuple[str, str]]:
+        """Get the n most recently seen lines as (text, style) ready for display"""
+        return [(entry.display(), entry.style) for entry in self.newest(n, since)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
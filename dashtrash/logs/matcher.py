@@ -0,0 +1,150 @@
+"""
+Log matcher for dashtrash - filters and classifies log lines in a single regex pass
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Line classes in priority order: name, keywords, style
+LINE_CLASSES = (
+    ('error', ('error', 'err', 'failed', 'failure'), 'bold red'),
+    ('warning', ('warning', 'warn', 'deprecated'), 'bold yellow'),
+    ('info', ('info', 'information'), 'bold blue'),
+    ('debug', ('debug', 'trace'), 'dim'),
+    ('success', ('success', 'completed', 'ok'), 'bold green'),
+    ('python', ('python',), 'bold magenta'),
+    ('git', ('git',), 'bold cyan'),
+)
+
+DEFAULT_STYLE = 'white'
+
+# Roles a keyword can play
+_INCLUDE = 'include'
+_EXCLUDE = 'exclude'
+
+
+class LogMatcher:
+    """Filters and classifies log lines with one compiled pattern
+
+    Plain filter terms and the class keywords are compiled into a single
+    case-insensitive alternation, so one scan of a line answers both "does
+    it pass the filters" and "which class colors it". The alternation sits
+    in a lookahead so every start position is tried and overlapping
+    keywords ("tracerror") are all seen, as with substring checks. Filters may also be
+    regular expressions (`re:pattern` or `/pattern/`) and any filter can be
+    negated with a leading `!`.
+    """
+
+    def __init__(self, filters: Sequence[str] = (), classes: Sequence[tuple] = LINE_CLASSES):
+        self.classes = tuple(classes)
+        self._roles = {}
+        include_patterns = []
+        exclude_patterns = []
+        self.has_includes = False
+
+        for raw in filters:
+            term = '' if raw is None else str(raw)
+            negated = term.startswith('!')
+            if negated:
+                term = term[1:]
+            pattern = _regex_filter(term)
+            # A blank entry (`- ""`, `- "!"`, `- "re:"`) filters nothing
+            if not (term if pattern is None else pattern).strip():
+                continue
+            self.has_includes = self.has_includes or not negated
+
+            if pattern is not None:
+                (exclude_patterns if negated else include_patterns).append(pattern)
+            else:
+                self._add_role(term, _EXCLUDE if negated else _INCLUDE)
+
+        for index, (_, keywords, _) in enumerate(self.classes):
+            for keyword in keywords:
+                self._add_role(keyword, index)
+
+        self._roles = _expand_contained(self._roles)
+        terms = sorted(self._roles, key=len, reverse=True)
+        # One group per keyword: a match is mapped back through its group
+        # number, since case folding can match text that doesn't lowercase
+        # to the keyword ("ſ" matches "s")
+        self._group_roles = [None] + [self._roles[term] for term in terms]
+        self._keywords = re.compile(
+            '(?=' + '|'.join(f'({re.escape(term)})' for term in terms) + ')', re.IGNORECASE
+        ) if terms else None
+        self._include_re = _combine(include_patterns)
+        self._exclude_re = _combine(exclude_patterns)
+
+    def _add_role(self, term: str, role):
+        """Record that a keyword includes, excludes or classifies a line"""
+        self._roles.setdefault(term.lower(), set()).add(role)
+
+    def classify(self, line: str) -> Tuple[bool, Optional[int]]:
+        """Get whether a line passes the filters and the index of its class (None if none)"""
+        included = not self.has_includes
+        excluded = False
+        best = None
+
+        if self._keywords is not None:
+            for match in self._keywords.finditer(line):
+                for role in self._group_roles[match.lastindex]:
+                    if role == _INCLUDE:
+                        included = True
+                    elif role == _EXCLUDE:
+                        excluded = True
+                    elif best is None or role < best:
+                        best = role
+                if excluded:
+                    return False, best
+
+        if not included and self._include_re is not None:
+            included = self._include_re.search(line) is not None
+        if included and self._exclude_re is not None:
+            excluded = self._exclude_re.search(line) is not None
+        return included and not excluded, best
+
+    def style(self, class_index: Optional[int]) -> str:
+        """Get the Rich style for a class index"""
+        if class_index is None:
+            return DEFAULT_STYLE
+        return self.classes[class_index][2]
+
+    def class_name(self, class_index: Optional[int]) -> Optional[str]:
+        """Get the name of a class index"""
+        if class_index is None:
+            return None
+        return self.classes[class_index][0]
+
+
+def _regex_filter(term: str) -> Optional[str]:
+    """Get the pattern of a regex filter, or None for a plain term"""
+    if term.startswith('re:'):
+        return term[3:]
+    if len(term) > 2 and term.startswith('/') and term.endswith('/'):
+        return term[1:-1]
+    return None
+
+
+def _combine(patterns: List[str]) -> Optional["re.Pattern"]:
+    """Compile several regex filters into one alternation"""
+    if not patterns:
+        return None
+    # Case-insensitive like the plain terms
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+def _expand_contained(roles: Dict[str, set]) -> Dict[str, set]:
+    """Give every keyword the roles of the keywords it contains
+
+    The alternation prefers the longest keyword at a position, so "error"
+    wins over "err" where both start; a line matching "error" must still
+    count for "err".
+    """
+    expanded = {}
+    for term, term_roles in roles.items():
+        merged = set(term_roles)
+        for other, other_roles in roles.items():
+            if other != term and other in term:
+                merged |= other_roles
+        expanded[term] = merged
+    return expanded
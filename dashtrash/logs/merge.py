@@ -0,0 +1,149 @@
+"""
+Multi-file tailing for dashtrash - follows every file matching a glob as one time-ordered stream
+"""
+
+import glob
+import heapq
+import os
+import time
+from collections import deque
+from itertools import islice, takewhile
+from typing import Any, Callable, List, Optional, Tuple
+
+from .tail import DEFAULT_MAX_BYTES
+from .compressed import open_tail
+from .timestamps import TimestampParser
+
+
+# How often the glob is expanded again to pick up new files, in seconds
+DEFAULT_RESCAN_INTERVAL = 30.0
+
+
+class MultiTail:
+    """Tails every file matching a glob and merges their newest lines by timestamp
+
+    Each file has its own TailReader and its own buffer of at most
+    `max_lines` entries, so memory is bounded per file however busy the
+    others are. Entries are stamped with the time parsed from their line
+    (lines without one, like traceback continuations, keep the time of the
+    line before them), and the newest lines overall are picked by a k-way
+    heap merge over the buffers. The glob itself is only expanded again
+    every `rescan_interval` seconds.
+    """
+
+    def __init__(self, pattern: str, max_lines: int = 15, max_bytes: int = DEFAULT_MAX_BYTES,
+                 rescan_interval: float = DEFAULT_RESCAN_INTERVAL, timestamp_format: Optional[str] = None):
+        self.pattern = os.path.expanduser(pattern)
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.rescan_interval = rescan_interval
+        self._parser = TimestampParser(timestamp_format)
+        self._sources = {}
+        self._next_scan = None
+        self._sequence = 0
+        # Compressed files renamed by a rotation resume where this tail left them
+        self._resume_key = object()
+
+    @property
+    def paths(self) -> List[str]:
+        """Get the files currently being followed"""
+        return list(self._sources)
+
+    @property
+    def progress(self) -> float:
+        """Get how far the least decompressed file has got (1.0 when none is compressed)"""
+        return min((getattr(source.reader, 'progress', 1.0) for source in self._sources.values()), default=1.0)
+
+    @property
+    def skipped_lines(self) -> int:
+        """Get the estimated number of lines skipped over in all files"""
+        return sum(source.reader.skipped_lines for source in self._sources.values())
+
+    def read(self, transform: Callable[[str], Any]):
+        """Read new lines from every file, buffering transform(line) unless it is None"""
+        now = time.monotonic()
+        if self._next_scan is None or now >= self._next_scan:
+            self._rescan()
+            self._next_scan = now + self.rescan_interval
+
+        for path, source in list(self._sources.items()):
+            try:
+                for line in source.reader.iter_lines():
+                    self._add(source, line, transform)
+            except FileNotFoundError:
+                # Deleted before its first read; forget it until it matches again
+                self._remove(path)
+
+    def newest(self, n: Optional[int] = None, since: Optional[float] = None) -> List[Tuple[str, Any]]:
+        """Get the newest n buffered (path, item) pairs across all files, oldest first
+
+        With `since`, only entries stamped at or after that epoch time are returned.
+        """
+        if n is None:
+            n = self.max_lines
+        merged = heapq.merge(
+            *(reversed(source.buffer) for source in self._sources.values()),
+            key=lambda entry: (entry[0], entry[1]),
+            reverse=True
+        )
+        if since is not None:
+            merged = takewhile(lambda entry: entry[0] >= since, merged)
+        return [(path, item) for _, _, path, item in reversed(list(islice(merged, n)))]
+
+    def close(self):
+        """Close every file"""
+        for source in self._sources.values():
+            source.reader.close()
+        self._sources = {}
+
+    def _add(self, source: "_Source", line: str, transform: Callable[[str], Any]):
+        """Stamp a line with its time and buffer what transform makes of it"""
+        timestamp = self._parser.parse(line)
+        if timestamp is None:
+            timestamp = source.last_timestamp
+        else:
+            source.last_timestamp = timestamp
+
+        item = transform(line)
+        if item is not None:
+            self._sequence += 1
+            source.buffer.append((timestamp, self._sequence, source.path, item))
+
+    def _rescan(self):
+        """Follow files that newly match the glob and drop the ones that are gone"""
+        matches = sorted(path for path in glob.glob(self.pattern) if os.path.isfile(path))
+        followed = {source.reader.identity for source in self._sources.values()}
+
+        for path in matches:
+            if path in self._sources:
+                continue
+            # A file we already follow under another name (app.log rotated to
+            # app.log.1) only contributes what is written to it from now on
+            initial_lines = self.max_lines
+            try:
+                stat = os.stat(path)
+                if (stat.st_dev, stat.st_ino) in followed:
+                    initial_lines = 0
+            except OSError:
+                continue
+            self._sources[path] = _Source(path, open_tail(path, initial_lines, self.max_bytes, self._resume_key), self.max_lines)
+
+        for path in list(self._sources):
+            if path not in matches:
+                self._remove(path)
+
+    def _remove(self, path: str):
+        """Stop following a file"""
+        source = self._sources.pop(path, None)
+        if source is not None:
+            source.reader.close()
+
+
+class _Source:
+    """One followed file: its reader and its buffer of stamped entries"""
+
+    def __init__(self, path: str, reader, max_lines: int):
+        self.path = path
+        self.reader = reader
+        self.buffer = deque(maxlen=max_lines)
+        self.last_timestamp = 0.0
@@ -0,0 +1,52 @@
+"""
+Rate counters for dashtrash - per-second event counts over a sliding window
+"""
+
+from array import array
+from typing import List, Optional
+
+
+class RateCounter:
+    """Per-second counts of a few event series over the last `seconds` seconds
+
+    Each series is a fixed ring of one counter per second, and a shared ring
+    records which second each slot currently holds. A slot is zeroed the
+    first time a new second lands on it, so old counts expire without ever
+    being scanned and memory is `seconds` counters per series.
+    """
+
+    def __init__(self, seconds: int, series: int):
+        self.seconds = max(1, int(seconds))
+        self._stamps = array('q', [-1]) * self.seconds
+        self._counts = [array('Q', [0]) * self.seconds for _ in range(series)]
+
+    def add(self, series: int, timestamp: float, count: int = 1):
+        """Count events of one series at a time"""
+        second = int(timestamp)
+        slot = second % self.seconds
+        stamp = self._stamps[slot]
+        if stamp != second:
+            if second < stamp:
+                # Older than the window
+                return
+            self._stamps[slot] = second
+            for counts in self._counts:
+                counts[slot] = 0
+        self._counts[series][slot] += count
+
+    def series(self, index: int, now: float, seconds: Optional[int] = None) -> List[int]:
+        """Get the per-second counts of a series for the last `seconds` seconds up to now, oldest first"""
+        if seconds is None or seconds > self.seconds:
+            seconds = self.seconds
+        end = int(now)
+        counts = self._counts[index]
+        stamps = self._stamps
+        result = []
+        for second in range(end - seconds + 1, end + 1):
+            slot = second % self.seconds
+            result.append(counts[slot] if stamps[slot] == second else 0)
+        return result
+
+    def total(self, index: int, now: float, seconds: Optional[int] = None) -> int:
+        """Get the number of events of a series in the last `seconds` seconds"""
+        return sum(self.series(index, now, seconds))
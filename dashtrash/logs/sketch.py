@@ -0,0 +1,169 @@
+"""
+Quantile sketches for dashtrash - constant-memory percentiles over sliding time windows
+"""
+
+import math
+from typing import Iterable, List, Optional
+
+
+# Quantiles are accurate to within this fraction of the true value
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Buckets kept per sketch; past this the lowest buckets are folded together,
+# which only costs accuracy at the fast end that nobody reads percentiles at
+MAX_BUCKETS = 2048
+
+
+class QuantileSketch:
+    """A mergeable log-bucket histogram (DDSketch-style) for positive values
+
+    A value v lands in bucket ceil(log(v) / log(gamma)) with
+    gamma = (1 + a) / (1 - a), so every bucket spans the same relative
+    width and any quantile read back is within a fraction `a` of the
+    true one. Sketches over the same accuracy merge by adding bucket
+    counts, which is what makes per-time-bucket sketches combine into
+    sliding windows.
+    """
+
+    __slots__ = ('accuracy', '_gamma_log', '_buckets', 'zero_count', 'count', 'total', 'max')
+
+    def __init__(self, accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.accuracy = accuracy
+        self._gamma_log = math.log((1 + accuracy) / (1 - accuracy))
+        self._buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float, count: int = 1):
+        """Record a value, ignoring inf and nan"""
+        if not math.isfinite(value):
+            return
+        self.count += count
+        self.total += value * count
+        if value > self.max:
+            self.max = value
+        if value <= 0:
+            self.zero_count += count
+            return
+
+        index = math.ceil(math.log(value) / self._gamma_log)
+        buckets = self._buckets
+        buckets[index] = buckets.get(index, 0) + count
+        if len(buckets) > MAX_BUCKETS:
+            self._collapse()
+
+    def merge(self, other: "QuantileSketch"):
+        """Add the values recorded by another sketch of the same accuracy"""
+        if not other.count:
+            return
+        buckets = self._buckets
+        for index, count in other._buckets.items():
+            buckets[index] = buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        if len(buckets) > MAX_BUCKETS:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Get the value at quantile q (0..1), or None if nothing was recorded"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                # The middle of the bucket, in the relative sense
+                return min(2 * math.exp(index * self._gamma_log) / (1 + math.exp(self._gamma_log)), self.max)
+        return self.max
+
+    def clear(self):
+        """Forget every value"""
+        self._buckets.clear()
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _collapse(self):
+        """Fold the lowest buckets into one so the sketch stays within MAX_BUCKETS"""
+        indexes = sorted(self._buckets)
+        excess = len(indexes) - MAX_BUCKETS + 1
+        folded = sum(self._buckets.pop(index) for index in indexes[:excess])
+        target = indexes[excess]
+        self._buckets[target] += folded
+
+
+class SlidingSketch:
+    """Quantile sketches for consecutive time buckets, merged on demand into sliding windows
+
+    A ring of `buckets` sketches each covering `bucket_seconds` seconds;
+    a slot is cleared when time moves onto it again. Memory is fixed by the
+    number of slots and MAX_BUCKETS, however many values are recorded.
+    """
+
+    def __init__(self, bucket_seconds: int = 10, buckets: int = 90,
+                 accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.bucket_seconds = max(1, int(bucket_seconds))
+        self.accuracy = accuracy
+        self._sketches = [QuantileSketch(accuracy) for _ in range(max(1, int(buckets)))]
+        self._stamps = [-1] * len(self._sketches)
+
+    @property
+    def span(self) -> int:
+        """Get the number of seconds covered by all buckets together"""
+        return self.bucket_seconds * len(self._sketches)
+
+    def add(self, value: float, timestamp: float, count: int = 1):
+        """Record a value in the time bucket of a timestamp"""
+        self._sketch(timestamp).add(value, count)
+
+    def add_all(self, values: Iterable[float], timestamp: float):
+        """Record several values in the time bucket of a timestamp"""
+        sketch = self._sketch(timestamp)
+        for value in values:
+            sketch.add(value)
+
+    def window(self, seconds: float, now: float) -> QuantileSketch:
+        """Get one sketch of every value recorded in the last `seconds` seconds"""
+        merged = QuantileSketch(self.accuracy)
+        for sketch in self._recent(seconds, now):
+            merged.merge(sketch)
+        return merged
+
+    def per_bucket(self, seconds: float, now: float, q: float) -> List[Optional[float]]:
+        """Get quantile q of each time bucket in the last `seconds` seconds, oldest first"""
+        return [sketch.quantile(q) for sketch in self._recent(seconds, now, include_empty=True)]
+
+    def _sketch(self, timestamp: float) -> QuantileSketch:
+        """Get the sketch of the time bucket a timestamp falls in, clearing a reused slot"""
+        bucket = int(timestamp // self.bucket_seconds)
+        slot = bucket % len(self._sketches)
+        if self._stamps[slot] != bucket:
+            self._stamps[slot] = bucket
+            self._sketches[slot].clear()
+        return self._sketches[slot]
+
+    def _recent(self, seconds: float, now: float, include_empty: bool = False) -> List[QuantileSketch]:
+        """Get the sketches of the time buckets in the last `seconds` seconds, oldest first"""
+        end = int(now // self.bucket_seconds)
+        count = min(len(self._sketches), max(1, math.ceil(seconds / self.bucket_seconds)))
+        empty = QuantileSketch(self.accuracy)
+        result = []
+        for bucket in range(end - count + 1, end + 1):
+            slot = bucket % len(self._sketches)
+            if self._stamps[slot] == bucket:
+                result.append(self._sketches[slot])
+            elif include_empty:
+                result.append(empty)
+        return result
+
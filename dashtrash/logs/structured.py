@@ -0,0 +1,256 @@
+"""
+Structured log parsing for dashtrash - JSON-lines records with field predicates
+"""
+
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .timestamps import TimestampParser
+
+
+# Keys tried for each display field when `fields` doesn't name one
+DEFAULT_FIELDS = {
+    'ts': ('ts', 'time', 'timestamp', '@timestamp'),
+    'level': ('level', 'severity', 'lvl', 'levelname'),
+    'msg': ('msg', 'message', 'event'),
+}
+
+OPERATORS = ('not in', 'in', '==', '!=', '>=', '<=', '>', '<', '~')
+
+_PREDICATE = re.compile(
+    r'^\s*([\w.@-]+)\s+(' + '|'.join(re.escape(op) for op in OPERATORS) + r')\s+(.+?)\s*$'
+)
+_COMPACT_PREDICATE = re.compile(r'^\s*([\w.@-]+)\s*(==|!=|>=|<=|>|<|~)\s*(.+?)\s*$')
+
+
+class FieldPredicate:
+    """One `where` condition on a record field, like `level in [error, warn]` or `latency_ms > 500`
+
+    String comparisons ignore case. Each predicate also knows which
+    substrings a raw line must contain for it to possibly hold, so most
+    lines can be rejected without being parsed.
+    """
+
+    def __init__(self, text: str):
+        match = _PREDICATE.match(text) or _COMPACT_PREDICATE.match(text)
+        if match is None:
+            raise ValueError(f"Invalid where clause: {text!r} (expected 'field op value')")
+        self.text = text
+        self.path = match.group(1).split('.')
+        self.operator = match.group(2)
+        raw = match.group(3)
+
+        if self.operator in ('in', 'not in'):
+            self.values = [_scalar(item) for item in _list_items(raw)]
+        elif self.operator == '~':
+            self.pattern = re.compile(_unquote(raw), re.IGNORECASE)
+        else:
+            self.value = _scalar(raw)
+            if self.operator in ('>', '>=', '<', '<=') and not isinstance(self.value, float):
+                raise ValueError(f"Invalid where clause: {text!r} ('{self.operator}' needs a number)")
+
+        self.required = self._required_substrings()
+
+    def _required_substrings(self) -> Tuple[str, ...]:
+        """Get lowercase substrings of which a matching line must contain at least one"""
+        field = f'"{self.path[-1].lower()}"'
+        if self.operator in ('in', '=='):
+            values = self.values if self.operator == 'in' else [self.value]
+            required = []
+            for value in values:
+                # Numbers match however they are written (500, 500.0, "500"), and
+                # strings JSON escapes may be written differently in the line
+                if isinstance(value, float) or json.dumps(value)[1:-1] != value:
+                    return (field,)
+                required.append(value)
+            return tuple(required)
+        if self.operator in ('!=', 'not in'):
+            # A record without the field passes, so nothing is required
+            return ()
+        return (field,)
+
+    def test(self, record: Dict[str, Any]) -> bool:
+        """Check the predicate against a parsed record"""
+        value = lookup(record, self.path)
+        op = self.operator
+        if op == 'in':
+            return any(_equal(value, option) for option in self.values)
+        if op == 'not in':
+            return not any(_equal(value, option) for option in self.values)
+        if op == '==':
+            return _equal(value, self.value)
+        if op == '!=':
+            return not _equal(value, self.value)
+        if op == '~':
+            return value is not None and self.pattern.search(str(value)) is not None
+
+        number = _number(value)
+        if number is None:
+            return False
+        if op == '>':
+            return number > self.value
+        if op == '>=':
+            return number >= self.value
+        if op == '<':
+            return number < self.value
+        return number <= self.value
+
+
+class JsonLineParser:
+    """Turns JSON log lines into short display lines, keeping only the records that match
+
+    Every `where` predicate names substrings that a matching line has to
+    contain, and those are checked on the raw line first; json.loads only
+    runs on lines that pass, so the parse cost follows the number of
+    matching lines rather than the log volume. Of a parsed record only the
+    configured fields (ts, level, msg and any `extra` keys) are kept.
+    """
+
+    def __init__(self, fields: Optional[Dict[str, str]] = None, extra: Sequence[str] = (),
+                 where: Sequence[str] = ()):
+        self.fields = {}
+        for name, defaults in DEFAULT_FIELDS.items():
+            configured = (fields or {}).get(name)
+            self.fields[name] = [configured.split('.')] if configured else [[key] for key in defaults]
+        self.extra = [(key, key.split('.')) for key in extra]
+        if isinstance(where, str):
+            where = [where]
+        self.predicates = [FieldPredicate(str(text)) for text in where]
+        self._checks = [predicate.required for predicate in self.predicates if predicate.required]
+        self._timestamps = TimestampParser()
+
+    def parse(self, line: str) -> Optional[Dict[str, Any]]:
+        """Get the display fields of a line, or None if it isn't a record matching every predicate"""
+        if self._checks:
+            lowered = line.lower()
+            for alternatives in self._checks:
+                if not any(alternative in lowered for alternative in alternatives):
+                    return None
+
+        if not line.lstrip().startswith('{'):
+            return None if self.predicates else {'msg': line}
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None if self.predicates else {'msg': line}
+        if not isinstance(record, dict):
+            return None
+
+        for predicate in self.predicates:
+            if not predicate.test(record):
+                return None
+
+        extra = []
+        for key, path in self.extra:
+            value = lookup(record, path)
+            if value is not None:
+                extra.append((key, value))
+        
+        return {
+            'ts': self._first(record, 'ts'),
+            'level': self._first(record, 'level'),
+            'msg': self._first(record, 'msg'),
+            'extra': extra,
+        }
+
+    def format(self, fields: Dict[str, Any]) -> str:
+        """Format extracted fields as one display line: time, level, message, key=value"""
+        parts = []
+        ts = fields.get('ts')
+        if ts is not None:
+            parts.append(self._format_time(ts))
+        if fields.get('level') is not None:
+            parts.append(f"{str(fields['level']).upper():<5}")
+        if fields.get('msg') is not None:
+            parts.append(str(fields['msg']))
+        parts.extend(f"{key}={_compact(value)}" for key, value in fields.get('extra', ()))
+        return ' '.join(parts)
+
+    def _first(self, record: Dict[str, Any], name: str) -> Any:
+        """Get the first configured key of a display field present in a record"""
+        for path in self.fields[name]:
+            value = lookup(record, path)
+            if value is not None:
+                return value
+        return None
+
+    def _format_time(self, value: Any) -> str:
+        """Show a record timestamp (epoch seconds/millis or a string) as local HH:MM:SS"""
+        epoch = _number(value)
+        if epoch is None:
+            epoch = self._timestamps.parse(str(value))
+            if epoch is None:
+                return str(value)
+        elif epoch > 1e11:
+            epoch /= 1000.0
+        try:
+            return time.strftime('%H:%M:%S', time.localtime(epoch))
+        except (OverflowError, OSError, ValueError):
+            # Out of the platform's time range (or nan)
+            return str(value)
+
+
+def lookup(record: Dict[str, Any], path: List[str]) -> Any:
+    """Get a possibly nested field (`http.status`) of a record, or None"""
+    value = record
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _list_items(raw: str) -> List[str]:
+    """Split a `[a, b]` list (brackets optional) into its items"""
+    raw = raw.strip()
+    if raw.startswith('[') and raw.endswith(']'):
+        raw = raw[1:-1]
+    return [item.strip() for item in raw.split(',') if item.strip()]
+
+
+def _unquote(raw: str) -> str:
+    """Strip matching quotes from a value"""
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in '"\'':
+        return raw[1:-1]
+    return raw
+
+
+def _scalar(raw: str) -> Any:
+    """Parse a predicate value: a number if it looks like one, otherwise a lowercase string"""
+    text = _unquote(raw)
+    if text == raw.strip():
+        number = _number(text)
+        if number is not None:
+            return number
+    return text.lower()
+
+
+def _number(value: Any) -> Optional[float]:
+    """Get a value as a float, or None if it isn't numeric"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _equal(value: Any, expected: Any) -> bool:
+    """Compare a record value with a predicate value, numerically or ignoring case"""
+    if isinstance(expected, float):
+        return _number(value) == expected
+    return value is not None and str(value).lower() == expected
+
+
+def _compact(value: Any) -> str:
+    """Show an extra field value compactly"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'))
+    return str(value)
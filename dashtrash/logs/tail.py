@@ -0,0 +1,206 @@
+"""
+Tail reader for dashtrash - follows a log file from its end across rotation and truncation
+"""
+
+import os
+from typing import Iterator, List, Optional
+
+
+# Bytes read per step when scanning backwards for the last lines
+BLOCK_SIZE = 8192
+
+# Bytes read per step when reading forwards
+CHUNK_SIZE = 64 * 1024
+
+# Default cap on bytes read per call; a bigger backlog is skipped
+DEFAULT_MAX_BYTES = 1024 * 1024
+
+# A "line" without a newline longer than this is cut off and emitted as is
+MAX_LINE_BYTES = 64 * 1024
+
+# Line length assumed for estimating skipped lines before any line was read
+DEFAULT_LINE_BYTES = 120
+
+
+class TailReader:
+    """Follows a log file, reading only the bytes appended since the last read
+
+    The first read returns the last `initial_lines` lines, found by seeking
+    backwards from the end in blocks. The file stays open between reads, and
+    rotation is detected by the path pointing at a different inode (the rest
+    of the old file is drained, then the new one is read from the start) and
+    truncation by the file shrinking below the read offset.
+
+    Each call reads at most `max_bytes`. When more than that was appended
+    since the last call, the reader jumps ahead to the newest `max_bytes`
+    and counts what it skipped, so a log storm costs the same as a quiet
+    log. Skipped lines are estimated from the average line length seen.
+    """
+
+    def __init__(self, path: str, initial_lines: int = 15, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = os.path.expanduser(path)
+        self.initial_lines = initial_lines
+        self.max_bytes = max_bytes
+        self.position = 0
+        self.skipped_bytes = 0
+        self.skipped_lines = 0
+        self._file = None
+        self._identity = None
+        self._partial = b''
+        self._bytes_read = 0
+        self._lines_read = 0
+
+    def read_lines(self) -> List[str]:
+        """Get the complete lines appended since the last call"""
+        return list(self.iter_lines())
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield the complete lines appended since the last call, a chunk at a time"""
+        if self._file is None:
+            yield from self._open_at_end()
+            return
+
+        budget = self.max_bytes
+        if self._replaced():
+            # Whatever the writer added to the old file before rotating it
+            for line in self._read_appended(budget):
+                budget -= len(line) + 1
+                yield line
+            self._partial = b''
+            self._open(from_start=True)
+        elif os.fstat(self._file.fileno()).st_size < self.position:
+            # Truncated in place (copytruncate, `> file`): start over
+            self.position = 0
+            self._partial = b''
+
+        yield from self._read_appended(max(budget, 0))
+
+    def open_at(self, offset: int):
+        """Open the file to read onwards from the line starting at offset instead of from the end"""
+        self._open()
+        self.position = min(offset, self.position)
+        self._partial = b''
+
+    def close(self):
+        """Close the file handle"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._identity = None
+
+    def _open(self, from_start: bool = False):
+        """Open the file at the path, remembering which inode it is"""
+        self.close()
+        self._file = open(self.path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        self.position = 0 if from_start else stat.st_size
+
+    def _open_at_end(self) -> List[str]:
+        """Open the file and get its last lines by reading backwards in blocks"""
+        self._open()
+        end = self.position
+        start = end
+        chunks = []
+        newlines = 0
+
+        # One more newline than lines wanted marks the start of the first one;
+        # the byte budget caps the scan for files with very long lines
+        while start > 0 and newlines <= self.initial_lines and end - start < self.max_bytes:
+            step = min(BLOCK_SIZE, start)
+            start -= step
+            self._file.seek(start)
+            chunk = self._file.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+
+        lines = self._split(b''.join(reversed(chunks)))
+        if start > 0:
+            # The first piece is the tail end of an older line
+            lines = lines[1:]
+        return lines[-self.initial_lines:] if self.initial_lines else []
+
+    def _replaced(self) -> bool:
+        """Check whether the path now points at a different file"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # Rotated away and not recreated yet; keep following the old file
+            return False
+        return (stat.st_dev, stat.st_ino) != self._identity
+
+    def _read_appended(self, budget: int) -> Iterator[str]:
+        """Read from the current offset towards the end of the file, within a byte budget"""
+        size = os.fstat(self._file.fileno()).st_size
+        skipped = 0
+        if size - self.position > budget:
+            skipped = self._skip_to(size - budget)
+        bytes_before, lines_before = self._bytes_read, self._lines_read
+
+        self._file.seek(self.position)
+        while self.position < size:
+            chunk = self._file.read(min(CHUNK_SIZE, size - self.position))
+            if not chunk:
+                break
+            self.position += len(chunk)
+            yield from self._split(chunk)
+
+        if skipped:
+            # The lines just read are the best guide to what the skipped ones looked like
+            lines = self._lines_read - lines_before
+            if lines:
+                average = (self._bytes_read - bytes_before) / lines
+            elif self._lines_read:
+                average = self._bytes_read / self._lines_read
+            else:
+                average = DEFAULT_LINE_BYTES
+            self.skipped_lines += max(1, round(skipped / average))
+
+    def _skip_to(self, offset: int) -> int:
+        """Jump ahead over a backlog to the first full line after offset, returning bytes skipped"""
+        skipped = offset - self.position + len(self._partial)
+        self._partial = b''
+        self.position = offset
+
+        # The jump almost certainly lands mid-line; drop the rest of that line
+        self._file.seek(offset)
+        while self.position - offset < MAX_LINE_BYTES:
+            chunk = self._file.read(BLOCK_SIZE)
+            if not chunk:
+                break
+            newline = chunk.find(b'\n')
+            if newline >= 0:
+                self.position += newline + 1
+                skipped += newline + 1
+                break
+            self.position += len(chunk)
+            skipped += len(chunk)
+
+        self.skipped_bytes += skipped
+        return skipped
+
+    def _split(self, data: bytes) -> List[str]:
+        """Split bytes into complete lines, holding back a trailing partial line"""
+        if not data:
+            return []
+        data = self._partial + data
+        pieces = data.split(b'\n')
+        self._partial = pieces.pop()
+        if len(self._partial) > MAX_LINE_BYTES:
+            # Runaway line without a newline: emit what we have rather than buffer forever
+            pieces.append(self._partial)
+            self._partial = b''
+
+        self._bytes_read += len(data) - len(self._partial)
+        self._lines_read += len(pieces)
+        return [piece.decode('utf-8', errors='ignore').rstrip('\r') for piece in pieces]
+
+    @property
+    def line_offset(self) -> int:
+        """Get the offset at which the next unread line starts"""
+        return self.position - len(self._partial)
+
+    @property
+    def identity(self) -> Optional[tuple]:
+        """Get the (device, inode) of the file being followed"""
+        return self._identity
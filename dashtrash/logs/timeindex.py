@@ -0,0 +1,119 @@
+"""
+Offset index for dashtrash - finds where a time window starts in a timestamped log file
+"""
+
+import bisect
+import os
+from typing import Optional, Tuple
+
+from .timestamps import TimestampParser
+
+
+# Index entries are kept at least this many bytes apart, and a window start
+# is narrowed down to within this many bytes before scanning
+INDEX_SPACING = 64 * 1024
+
+# Bytes read at a probe point to find a line with a timestamp
+PROBE_BYTES = 16 * 1024
+
+
+class OffsetIndex:
+    """A sparse offset -> timestamp index of one log file
+
+    Finding the first line of a time window is a binary search over byte
+    offsets: seek to the middle, skip to the next line, parse its timestamp,
+    and halve the range. Every probe is remembered as an index entry, and the
+    panel adds an entry as it tails, so the index grows with the file and
+    later searches start from a narrow range. The index is dropped when the
+    file is rotated or truncated. Timestamps are assumed to be in order, as
+    they are in any log written by one process.
+    """
+
+    def __init__(self, parser: Optional[TimestampParser] = None, spacing: int = INDEX_SPACING):
+        self.parser = parser or TimestampParser()
+        self.spacing = spacing
+        self.identity = None
+        self.size = 0
+        self._offsets = []
+        self._times = []
+
+    def find(self, path: str, since: float) -> int:
+        """Get the offset of a line start at or shortly before the first line newer than since"""
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            identity = (stat.st_dev, stat.st_ino)
+            if identity != self.identity or stat.st_size < self.size:
+                self._reset(identity)
+            self.size = stat.st_size
+
+            # The index narrows the range before any byte is read
+            position = bisect.bisect_left(self._times, since)
+            low = self._offsets[position - 1] if position else 0
+            high = self._offsets[position] if position < len(self._offsets) else stat.st_size
+
+            while high - low > self.spacing:
+                middle = (low + high) // 2
+                probe = self._probe(f, middle, high)
+                if probe is None:
+                    # No timestamps past the middle; the window can't start there
+                    high = middle
+                    continue
+                offset, timestamp = probe
+                self.add(offset, timestamp)
+                if timestamp < since:
+                    low = offset
+                else:
+                    high = middle
+            return low
+
+    def add(self, offset: int, timestamp: float):
+        """Remember that the lines from offset on are no older than timestamp"""
+        position = bisect.bisect_left(self._offsets, offset)
+        neighbours = self._offsets[max(position - 1, 0):position + 1]
+        if any(abs(offset - other) < self.spacing for other in neighbours):
+            return
+        self._offsets.insert(position, offset)
+        self._times.insert(position, timestamp)
+
+    def note(self, identity: Optional[tuple], offset: int, timestamp: float):
+        """Extend the index while tailing: everything from offset on is no older than timestamp"""
+        if identity is None:
+            return
+        if identity != self.identity:
+            # The reader moved on to a rotated-in file
+            self._reset(identity)
+        self.size = max(self.size, offset)
+        self.add(offset, timestamp)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _reset(self, identity: tuple):
+        """Forget the entries of a file that was rotated or truncated"""
+        self.identity = identity
+        self.size = 0
+        self._offsets = []
+        self._times = []
+
+    def _probe(self, f, offset: int, limit: int) -> Optional[Tuple[int, float]]:
+        """Get the offset and timestamp of the first timestamped line starting after offset"""
+        start = max(offset - 1, 0)
+        f.seek(start)
+        data = f.read(min(PROBE_BYTES, limit - start))
+        if start:
+            # Skip to the first line that starts after the probe point
+            newline = data.find(b'\n')
+            if newline < 0:
+                return None
+            position = newline + 1
+        else:
+            position = 0
+
+        while True:
+            end = data.find(b'\n', position)
+            if end < 0:
+                return None
+            timestamp = self.parser.parse(data[position:end].decode('utf-8', errors='ignore'))
+            if timestamp is not None:
+                return start + position, timestamp
+            position = end + 1
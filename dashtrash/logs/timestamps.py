@@ -0,0 +1,164 @@
+"""
+Timestamp parsing for dashtrash - finds and parses the time a log line was written
+"""
+
+import calendar
+import re
+import time
+from datetime import datetime
+from typing import Optional
+
+
+# Only the start of a line is searched; timestamps come first in practice
+SEARCH_CHARS = 64
+
+# Parsed values cached per parser before the cache is cleared
+CACHE_SIZE = 4096
+
+_ISO = re.compile(
+    # The zone must end at a word boundary, so "10:00:00 Zookeeper" is local time
+    r'(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:[.,](\d+))?(?:\s?(Z|[+-]\d{2}:?\d{2})\b)?'
+)
+_SYSLOG = re.compile(r'\b([A-Z][a-z]{2}) +(\d{1,2}) (\d{2}):(\d{2}):(\d{2})\b')
+
+_MONTHS = {name: index for index, name in enumerate(calendar.month_abbr) if name}
+
+# strptime directives and the text they match
+_DIRECTIVES = {
+    'Y': r'\d{4}', 'y': r'\d{2}', 'm': r'\d{1,2}', 'd': r'\d{1,2}', 'H': r'\d{1,2}',
+    'I': r'\d{1,2}', 'M': r'\d{2}', 'S': r'\d{2}', 'f': r'\d{1,6}', 'j': r'\d{3}',
+    'b': r'[A-Za-z]{3}', 'B': r'[A-Za-z]+', 'a': r'[A-Za-z]{3}', 'A': r'[A-Za-z]+',
+    'p': r'[AaPp][Mm]', 'z': r'[+-]\d{2}:?\d{2}|Z', 'Z': r'[A-Za-z]+', '%': '%',
+}
+
+
+class TimestampParser:
+    """Finds the timestamp near the start of a log line and converts it to epoch seconds
+
+    Without a format it recognizes ISO 8601 (`2024-05-01T12:00:00.123Z`, also
+    with a space) and syslog (`May  1 12:00:00`) timestamps. With a strptime
+    format the format is turned into a regex once, so the line is searched for
+    the timestamp wherever it is (e.g. inside brackets in an access log).
+    Timestamps without a zone are local time.
+    """
+
+    def __init__(self, fmt: Optional[str] = None):
+        self.format = fmt
+        self._format_re = re.compile(_format_regex(fmt)) if fmt else None
+        self._cache = {}
+
+    def parse(self, line: str) -> Optional[float]:
+        """Get the timestamp of a line in epoch seconds, or None if it has none"""
+        if self._format_re is not None:
+            return self._parse_format(line)
+
+        match = _ISO.search(line, 0, SEARCH_CHARS)
+        if match is not None:
+            return self._parse_iso(match)
+        match = _SYSLOG.search(line, 0, SEARCH_CHARS)
+        if match is not None:
+            return self._parse_syslog(match)
+        return None
+
+    def _parse_iso(self, match) -> Optional[float]:
+        """Convert an ISO 8601 match, caching the conversion of its minute"""
+        year, month, day, hour, minute, second, fraction, zone = match.groups()
+        if int(second) > 60:
+            return None
+        key = (year, month, day, hour, minute, zone)
+        base = self._cache.get(key)
+        if base is None:
+            fields = (int(year), int(month), int(day), int(hour), int(minute), 0)
+            if not _valid_date(*fields[:5]):
+                return None
+            try:
+                if zone is None:
+                    base = time.mktime(fields + (0, 0, -1))
+                else:
+                    base = calendar.timegm(fields) - _zone_offset(zone)
+            except (OverflowError, OSError, ValueError):
+                # Out of the platform's time range
+                return None
+            self._store(key, base)
+
+        value = base + int(second)
+        if fraction:
+            value += int(fraction) / 10 ** len(fraction)
+        return value
+
+    def _parse_syslog(self, match) -> Optional[float]:
+        """Convert a syslog match, which has no year, to the most recent such time"""
+        month = _MONTHS.get(match.group(1))
+        if month is None:
+            return None
+
+        key = match.group(0)
+        value = self._cache.get(key)
+        if value is None:
+            day, hour, minute, second = (int(group) for group in match.groups()[1:])
+            year = time.localtime().tm_year
+            # Feb 29 is only checked against the year it turns out to be in
+            if not _valid_date(2000, month, day, hour, minute) or second > 60:
+                return None
+            try:
+                value = time.mktime((year, month, day, hour, minute, second, 0, 0, -1))
+                if value > time.time() + 86400:
+                    # December's lines read in January
+                    value = time.mktime((year - 1, month, day, hour, minute, second, 0, 0, -1))
+            except (OverflowError, OSError, ValueError):
+                return None
+            self._store(key, value)
+        return value
+
+    def _parse_format(self, line: str) -> Optional[float]:
+        """Find and convert a timestamp in the configured strptime format"""
+        match = self._format_re.search(line)
+        if match is None:
+            return None
+
+        text = match.group(0)
+        value = self._cache.get(text)
+        if value is None:
+            try:
+                value = datetime.strptime(text, self.format).timestamp()
+            except (OverflowError, OSError, ValueError):
+                return None
+            self._store(text, value)
+        return value
+
+    def _store(self, key, value: float):
+        """Cache a conversion, starting over when the cache is full"""
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = value
+
+
+def _valid_date(year: int, month: int, day: int, hour: int, minute: int) -> bool:
+    """Check the fields of a date and time, which mktime would otherwise silently roll over"""
+    if not (1 <= month <= 12 and hour < 24 and minute < 60):
+        return False
+    return 1 <= day <= calendar.mdays[month] + (month == 2 and calendar.isleap(year))
+
+
+def _zone_offset(zone: str) -> int:
+    """Get the UTC offset in seconds of a `Z` or `+hh:mm` zone"""
+    if zone == 'Z':
+        return 0
+    sign = -1 if zone[0] == '-' else 1
+    digits = zone[1:].replace(':', '')
+    return sign * (int(digits[:2]) * 3600 + int(digits[2:]) * 60)
+
+
+def _format_regex(fmt: str) -> str:
+    """Translate a strptime format into a regex matching the text it parses"""
+    pattern = []
+    index = 0
+    while index < len(fmt):
+        char = fmt[index]
+        if char == '%' and index + 1 < len(fmt):
+            pattern.append(_DIRECTIVES.get(fmt[index + 1], r'\S+?'))
+            index += 2
+        else:
+            pattern.append(r'\s+' if char == ' ' else re.escape(char))
+            index += 1
+    return ''.join(f'(?:{part})' if '|' in part else part for part in pattern)
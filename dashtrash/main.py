@@ -11,8 +11,8 @@ import sys
 import os
 from pathlib import Path
 
-from .core import Dashboard
-from .config import Config
+# The dashboard engine, rich, psutil and the panels are imported where they
+# are used: --version, --validate and --create-config never need them
 
 
 def main():
@@ -26,11 +26,21 @@ Examples:
   dashtrash -c custom.yml      # Run with custom config file
   dashtrash --validate         # Validate configuration only
   dashtrash --create-config    # Create default configuration file
+  dashtrash collect            # Sample the panels once for any number of viewers
+  dashtrash view               # Show the dashboard of a running collector
 
 Real-time dashboards. Questionable aesthetics.
         """
     )
     
+    parser.add_argument(
+        'command',
+        nargs='?',
+        default='run',
+        choices=['run', 'collect', 'view'],
+        help='run a dashboard (default), collect panel data for viewers, or view a collector'
+    )
+    
     parser.add_argument(
         '-c', '--config',
         default='dashboard.yml',
@@ -49,6 +59,18 @@ Real-time dashboards. Questionable aesthetics.
         help='Create a default configuration file and exit'
     )
     
+    parser.add_argument(
+        '--socket',
+        help='Socket of the collector (default: $XDG_RUNTIME_DIR/dashtrash.sock)'
+    )
+    
+    parser.add_argument(
+        '--socket-mode',
+        type=lambda mode: int(mode, 8),
+        default=0o600,
+        help='Permissions of the collector socket, in octal (default: 600)'
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -66,6 +88,10 @@ Real-time dashboards. Questionable aesthetics.
         validate_config(args.config)
         return
     
+    if args.command == 'view':
+        view_collector(args.socket)
+        return
+    
     # Check if config file exists
     if not os.path.exists(args.config):
         print(f"Configuration file '{args.config}' not found.")
@@ -77,7 +103,12 @@ Real-time dashboards. Questionable aesthetics.
     
     try:
         # Create and start dashboard
-        dashboard = Dashboard(args.config)
+        if args.command == 'collect':
+            from .remote import Collector
+            dashboard = Collector(args.config, args.socket, args.socket_mode)
+        else:
+            from .core import Dashboard
+            dashboard = Dashboard(args.config)
         dashboard.start()
         
     except KeyboardInterrupt:
@@ -87,8 +118,25 @@ Real-time dashboards. Questionable aesthetics.
         sys.exit(1)
 
 
+def view_collector(socket_path: str):
+    """Show the dashboard of a running collector"""
+    from .remote import Viewer, default_socket_path
+    socket_path = socket_path or default_socket_path()
+    try:
+        viewer = Viewer(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"❌ No collector running on '{socket_path}'", file=sys.stderr)
+        print("   Start one with: dashtrash collect", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Error connecting to the collector: {e}", file=sys.stderr)
+        sys.exit(1)
+    viewer.start()
+
+
 def create_default_config(config_path: str):
     """Create a default configuration file"""
+    from .config import Config
     try:
         config = Config(config_path)
         print(f"✅ Default configuration created at '{config_path}'")
@@ -104,6 +152,7 @@ def create_default_config(config_path: str):
 
 def validate_config(config_path: str):
     """Validate configuration file"""
+    from .config import Config
     try:
         if not os.path.exists(config_path):
             print(f"❌ Configuration file '{config_path}' not found")
@@ -119,9 +168,9 @@ def validate_config(config_path: str):
             print(f"   - Refresh rate: {config.get_refresh_rate()}s")
             print(f"   - Panels configured: {len(panels)}")
             
-            for i, panel in enumerate(panels, 1):
+            for i, (panel_id, panel) in enumerate(config.get_panel_entries(), 1):
                 panel_type = panel.get('type', 'unknown')
-                print(f"     {i}. {panel_type.title()} Panel")
+                print(f"     {i}. {panel_type.title()} Panel ({panel_id})")
                 if panel_type == 'logs':
                     log_file = panel.get('file', 'N/A')
                     print(f"        Log file: {log_file}")
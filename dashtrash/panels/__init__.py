@@ -1,10 +1,40 @@
 """
 Panels package for dashtrash - contains all dashboard panel implementations
+
+Panel modules are imported on first use, so a dashboard only pays for the
+panel types it is configured with and `dashtrash --validate` for none.
 """
 
-from .system import SystemPanel
-from .logs import LogsPanel
-from .temperature import TemperaturePanel
-from .clock import ClockPanel
+import importlib
+from typing import Any
+
+# Panel type in the config -> (module in this package, class name)
+PANEL_TYPES = {
+    'system': ('.system', 'SystemPanel'),
+    'logs': ('.logs', 'LogsPanel'),
+    'temperature': ('.temperature', 'TemperaturePanel'),
+    'clock': ('.clock', 'ClockPanel'),
+    'log_rate': ('.lograte', 'LogRatePanel'),
+    'latency': ('.latency', 'LatencyPanel'),
+}
+
+_CLASS_MODULES = {class_name: module for module, class_name in PANEL_TYPES.values()}
+
+
+def get_panel_class(panel_type: str) -> Any:
+    """Import and get the panel class for a panel type, or None for an unknown type"""
+    if panel_type not in PANEL_TYPES:
+        return None
+    module, class_name = PANEL_TYPES[panel_type]
+    return getattr(importlib.import_module(module, __name__), class_name)
+
+
+def __getattr__(name: str) -> Any:
+    # `from dashtrash.panels import LogsPanel` keeps working, importing only that module
+    if name in _CLASS_MODULES:
+        return getattr(importlib.import_module(_CLASS_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ['SystemPanel', 'LogsPanel', 'TemperaturePanel', 'ClockPanel'] 
\ No newline at end of file
+__all__ = ['SystemPanel', 'LogsPanel', 'TemperaturePanel', 'ClockPanel', 'LogRatePanel', 'LatencyPanel',
+           'PANEL_TYPES', 'get_panel_class']
@@ -4,22 +4,38 @@ Clock panel for dashtrash - displays time, date, and timezone info
 
 import time
 import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 from rich.console import Group
 from rich.align import Align
-import pyfiglet
+
+from ..figlet import CLOCK_GLYPHS, get_glyph_cache
+from ..sampler import MetricsSampler, get_sampler
 
 
 class ClockPanel:
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None, sampler: Optional[MetricsSampler] = None):
         self.config = config or {}
-        self.show_timezone = self.config.get('show_timezone', True)
-        self.show_uptime = self.config.get('show_uptime', True)
+        self.sampler = sampler or get_sampler()
         self.time_format = self.config.get('time_format', '24h')  # '12h' or '24h'
+        self._configure_render()
         
+    @classmethod
+    def for_render(cls, config: Dict[str, Any] = None) -> "ClockPanel":
+        """Create a panel that only renders snapshots fetched elsewhere (no sampler)"""
+        panel = cls.__new__(cls)
+        panel.config = config or {}
+        panel._configure_render()
+        return panel
+
+    def _configure_render(self):
+        """Set up what render() reads from the config"""
+        self.show_timezone = self.config.get('show_timezone', True)
+        self.show_uptime = self.config.get('show_uptime', True)
+        self._glyphs = get_glyph_cache("small", CLOCK_GLYPHS)
+
     def fetch_data(self) -> Dict[str, Any]:
         """Fetch current time and date information"""
         try:
@@ -36,8 +52,7 @@ class ClockPanel:
             
             # Calculate uptime (basic estimation)
             try:
-                import psutil
-                boot_time = psutil.boot_time()
+                boot_time = self.sampler.get('boot_time')
                 uptime_seconds = time.time() - boot_time
                 uptime_str = self._format_uptime(uptime_seconds)
             except:
@@ -83,10 +98,7 @@ class ClockPanel:
     
     def _create_ascii_time(self, time_str: str) -> str:
         """Create ASCII art for time (smaller version)"""
-        try:
-            return pyfiglet.figlet_format(time_str, font="small")
-        except:
-            return pyfiglet.figlet_format(time_str, font="standard")
+        return self._glyphs.render(time_str)
     
     def render(self, data: Dict[str, Any]) -> Panel:
         """Render the clock panel"""
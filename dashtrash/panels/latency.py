@@ -0,0 +1,220 @@
+"""
+Latency panel for dashtrash - p50/p95/p99 of a duration field in a log, over sliding windows
+"""
+
+import math
+import os
+import re
+import time
+from typing import Dict, Any, List, Optional
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+from rich.console import Group
+
+from .logs import LogsPanel
+from ..config import parse_duration
+from ..logs.sketch import SlidingSketch
+
+
+# Windows shown when the config doesn't list any
+DEFAULT_WINDOWS = ['1m', '5m', '15m']
+
+# Width of one time bucket; windows are whole numbers of these
+BUCKET_SECONDS = 10
+
+# Seconds per unit a duration field can be logged in
+UNITS = {'s': 1.0, 'ms': 1e-3, 'us': 1e-6, 'µs': 1e-6, 'ns': 1e-9}
+
+QUANTILES = (('p50', 0.50), ('p95', 0.95), ('p99', 0.99))
+
+# Time buckets shown in the p95 trend line, newest last
+TREND_BUCKETS = 40
+
+
+class LatencyPanel(LogsPanel):
+    """Extracts a duration field from log lines and shows its percentiles over sliding windows
+
+    The field is pulled out by one precompiled pattern (by default
+    `field=0.123`, `field: 45` or `"field": 45`), after a plain substring
+    check so lines without the field cost almost nothing. Values go into a
+    quantile sketch per 10-second bucket; windows merge the buckets they
+    cover. Memory is fixed however many requests per second are logged.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        super().__init__(config)
+        self.unit = self.config.get('unit', 'ms')
+        self._scale = UNITS.get(self.unit)
+        if self._scale is None:
+            self._matcher_error = f"Unknown unit '{self.unit}' (expected one of: {', '.join(UNITS)})"
+            self._scale = 1.0
+
+        try:
+            self._pattern = re.compile(self.config.get('pattern') or _field_pattern(self.field))
+        except re.error as e:
+            self._pattern = None
+            self._matcher_error = f"Invalid latency pattern: {e}"
+        # A custom pattern may not contain the field name literally
+        self._needle = None if self.config.get('pattern') else self.field
+
+        self.windows = []
+        for window in self.config.get('windows', DEFAULT_WINDOWS):
+            seconds = parse_duration(window)
+            if seconds is None:
+                self._matcher_error = f"Invalid window '{window}'"
+                continue
+            self.windows.append((str(window), seconds))
+        longest = max((seconds for _, seconds in self.windows), default=60)
+        self._sketch = SlidingSketch(BUCKET_SECONDS, -(-int(longest) // BUCKET_SECONDS) + 1)
+        self._values = []
+
+    def reconfigure(self, config: Dict[str, Any]) -> bool:
+        """Apply a changed config in place unless it changes what is measured"""
+        if self._matcher_error or any(config.get(key) != self.config.get(key)
+                                      for key in ('field', 'unit', 'pattern', 'windows')):
+            return False
+        return super().reconfigure(config)
+
+    def _configure_render(self):
+        """Set up what render() reads from the config"""
+        super()._configure_render()
+        self.field = str(self.config.get('field', 'duration_ms'))
+
+    def _create_reader(self, initial_lines: int):
+        """Create the reader without an initial backlog, so old requests don't count as new"""
+        return super()._create_reader(0)
+
+    def fetch_data(self) -> Dict[str, Any]:
+        """Extract the durations logged since the last fetch and get percentiles per window"""
+        try:
+            if self._matcher_error:
+                return {'error': self._matcher_error}
+
+            now = time.time()
+            if self._multi:
+                self._reader.read(self._extract)
+                if not self._reader.paths:
+                    return {'error': f'No log files match: {self._path}'}
+            else:
+                extract = self._extract
+                try:
+                    for line in self._reader.iter_lines():
+                        extract(line)
+                except FileNotFoundError:
+                    return {'error': f'Log file not found: {self._path}'}
+
+            # Taken before adding, so a value the sketch rejects can't come back every fetch
+            values, self._values = self._values, []
+            if values:
+                self._sketch.add_all(values, now)
+
+            windows = []
+            for label, seconds in self.windows:
+                sketch = self._sketch.window(seconds, now)
+                row = {'window': label, 'count': sketch.count, 'rate': sketch.count / seconds}
+                for name, q in QUANTILES:
+                    row[name] = sketch.quantile(q)
+                windows.append(row)
+
+            return {
+                'file': self._path,
+                'field': self.field,
+                'windows': windows,
+                'trend': self._sketch.per_bucket(TREND_BUCKETS * BUCKET_SECONDS, now, 0.95),
+                'dropped_lines': self._reader.skipped_lines
+            }
+
+        except Exception as e:
+            return {'error': str(e)}
+
+    def _extract(self, line: str):
+        """Pull the duration out of a line that passes the filters, in seconds"""
+        if self._needle is not None and self._needle not in line:
+            return None
+        match = self._pattern.search(line)
+        if match is None:
+            return None
+        if self.filters and self._match(line) is None:
+            return None
+        try:
+            value = float(match.group(1)) * self._scale
+        except (ValueError, IndexError):
+            return None
+        # "1e999" parses as inf; 0.000 (a cached nginx response) is a real duration
+        if math.isfinite(value) and value >= 0:
+            self._values.append(value)
+        return None
+
+    def _format_duration(self, seconds: Optional[float]) -> str:
+        """Format a duration with a sensible unit"""
+        if seconds is None:
+            return "-"
+        if seconds < 1e-3:
+            return f"{seconds * 1e6:.0f}µs"
+        if seconds < 1:
+            return f"{seconds * 1e3:.1f}ms"
+        return f"{seconds:.2f}s"
+
+    def _get_latency_color(self, seconds: Optional[float]) -> str:
+        """Get color for a latency relative to the configured thresholds"""
+        if seconds is None:
+            return "dim"
+        warn = self.config.get('warn_ms', 250) / 1e3
+        crit = self.config.get('critical_ms', 1000) / 1e3
+        if seconds >= crit:
+            return "red"
+        elif seconds >= warn:
+            return "yellow"
+        return "green"
+
+    def _create_sparkline(self, values: List[Optional[float]]) -> str:
+        """Create a sparkline of per-bucket values, blank where a bucket had no requests"""
+        blocks = ["▁", "▂", "▃", "▄", "▅", "▆", "▇", "█"]
+        present = [value for value in values if value is not None]
+        if not present:
+            return " " * len(values)
+        low, high = min(present), max(present)
+        span = high - low or 1
+        return "".join(
+            " " if value is None else blocks[min(7, int((value - low) / span * 7.999))]
+            for value in values
+        )
+
+    def render(self, data: Dict[str, Any]) -> Panel:
+        """Render the latency panel"""
+        if 'error' in data:
+            return Panel(f"[red]Error: {data['error']}[/red]", title="[bold red]Latency - Error[/bold red]")
+
+        table = Table(show_header=True, header_style="bold blue", box=None, padding=(0, 1))
+        table.add_column("Window", style="cyan", width=7)
+        table.add_column("Requests", justify="right", width=9)
+        table.add_column("Rate", justify="right", width=9)
+        for name, _ in QUANTILES:
+            table.add_column(name, justify="right", width=9)
+
+        for row in data.get('windows', []):
+            cells = [row['window'], str(row['count']), f"{row['rate']:.1f}/s"]
+            for name, _ in QUANTILES:
+                color = self._get_latency_color(row[name])
+                cells.append(f"[{color}]{self._format_duration(row[name])}[/{color}]")
+            table.add_row(*cells)
+
+        trend = Text()
+        trend.append("p95 ", style="dim")
+        trend.append(self._create_sparkline(data.get('trend', [])), style="cyan")
+        if data.get('dropped_lines'):
+            trend.append(f"  ~{data['dropped_lines']} lines skipped", style="dim red")
+
+        file_name = os.path.basename(data.get('file', 'unknown'))
+        return Panel(
+            Group(table, "", trend),
+            title=f"[bold green]⏱️ Latency: {data.get('field', self.field)} in {file_name}[/bold green]",
+            border_style="green",
+            padding=(1, 2)
+        )
+
+
+def _field_pattern(field: str) -> str:
+    """Get the pattern matching `field=1.5`, `field: 1.5` or `"field": 1.5` and capturing the number"""
+    return r'(?<![\w.])"?' + re.escape(field) + r'"?\s*[:=]\s*"?(\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)'
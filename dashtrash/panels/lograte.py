@@ -0,0 +1,186 @@
+"""
+Log rate panel for dashtrash - error/warning/info rates per second as sparklines
+"""
+
+import os
+import time
+from typing import Dict, Any, List
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+from rich.console import Group
+
+from .logs import LogsPanel
+from ..logs.rates import RateCounter
+
+
+# Levels charted when the config doesn't list any
+DEFAULT_LEVELS = ['error', 'warning', 'info']
+
+# The "now" rate is averaged over this many seconds
+RATE_SECONDS = 10
+
+# Sparkline width in characters; each character covers several seconds
+CHART_WIDTH = 40
+
+
+class LogRatePanel(LogsPanel):
+    """Counts log lines per level and second while tailing, shown as rates and sparklines
+
+    Lines are read by the same readers as the logs panel (single files,
+    globs, compressed files) and classified by the same single-pass matcher;
+    counting is one increment per line into fixed per-second rings, and
+    nothing is ever re-scanned. Lines are counted at the second of their own
+    timestamp, so a backlog read in one go (a compressed file, a slow tick)
+    doesn't show as a burst; a line without one takes the time of the line
+    before it, or the time it is read.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        super().__init__(config)
+        self.levels = [str(level).lower() for level in self.config.get('levels', DEFAULT_LEVELS)]
+        self._counter = RateCounter(int(self.minutes * 60), len(self.levels))
+        self._now = 0.0
+        self._line_time = None
+
+        # Map the matcher's class indexes onto the charted levels
+        class_names = [name for name, _, _ in self._matcher.classes]
+        self._level_of = {}
+        self._styles = []
+        for row, level in enumerate(self.levels):
+            if level not in class_names:
+                self._matcher_error = (f"Unknown level '{level}' "
+                                       f"(expected one of: {', '.join(class_names)})")
+                self._styles.append(self._matcher.style(None))
+                continue
+            self._level_of[class_names.index(level)] = row
+            self._styles.append(self._matcher.style(class_names.index(level)))
+
+    def reconfigure(self, config: Dict[str, Any]) -> bool:
+        """Apply a changed config in place unless it changes what is counted"""
+        if self._matcher_error or any(config.get(key) != self.config.get(key)
+                                      for key in ('levels', 'minutes', 'filters')):
+            return False
+        return super().reconfigure(config)
+
+    def _configure_render(self):
+        """Set up what render() reads from the config"""
+        super()._configure_render()
+        self.minutes = self.config.get('minutes', 5)
+
+    def _create_reader(self, initial_lines: int):
+        """Create the reader without an initial backlog, so startup doesn't show as a spike"""
+        return super()._create_reader(0)
+
+    def fetch_data(self) -> Dict[str, Any]:
+        """Count the lines appended since the last fetch and get the rates per level"""
+        try:
+            if self._matcher_error:
+                return {'error': self._matcher_error}
+
+            now = time.time()
+            self._now = now
+            self._line_time = None
+            if self._multi:
+                # The transform counts and buffers nothing
+                self._reader.read(self._count)
+                if not self._reader.paths:
+                    return {'error': f'No log files match: {self._path}'}
+            else:
+                count = self._count
+                try:
+                    for line in self._reader.iter_lines():
+                        count(line)
+                except FileNotFoundError:
+                    return {'error': f'Log file not found: {self._path}'}
+
+            levels = []
+            for row, level in enumerate(self.levels):
+                series = self._counter.series(row, now)
+                levels.append({
+                    'name': level,
+                    'style': self._styles[row],
+                    'columns': self._columns(series),
+                    'rate': sum(series[-RATE_SECONDS:]) / RATE_SECONDS,
+                    'total': sum(series)
+                })
+
+            return {
+                'file': self._path,
+                'levels': levels,
+                'minutes': self.minutes,
+                'column_seconds': self._counter.seconds / max(1, min(CHART_WIDTH, self._counter.seconds)),
+                'dropped_lines': self._reader.skipped_lines
+            }
+
+        except Exception as e:
+            return {'error': str(e)}
+
+    def _count(self, line: str):
+        """Count a line against its level at its timestamp, if it passes the filters and is a charted level"""
+        matched = self._match(line)
+        if matched is None:
+            return None
+        row = self._level_of.get(matched[0])
+        if row is None:
+            return None
+
+        timestamp = self._timestamps.parse(line)
+        if timestamp is not None:
+            # A clock ahead of ours would count into seconds the chart hasn't reached
+            self._line_time = min(timestamp, self._now)
+        elif self._line_time is None:
+            self._line_time = self._now
+        self._counter.add(row, self._line_time)
+        return None
+
+    def _columns(self, series: List[int]) -> List[int]:
+        """Sum per-second counts into CHART_WIDTH columns"""
+        if len(series) <= CHART_WIDTH:
+            return list(series)
+        step = len(series) / CHART_WIDTH
+        return [sum(series[int(i * step):int((i + 1) * step)]) for i in range(CHART_WIDTH)]
+
+    def _create_sparkline(self, columns: List[int], peak: int) -> str:
+        """Create a sparkline scaled to a shared peak so levels compare at a glance"""
+        blocks = ["▁", "▂", "▃", "▄", "▅", "▆", "▇", "█"]
+        if not peak:
+            return blocks[0] * len(columns)
+        return "".join(blocks[min(7, int(value / peak * 7.999))] if value else " " for value in columns)
+
+    def render(self, data: Dict[str, Any]) -> Panel:
+        """Render the log rate panel"""
+        if 'error' in data:
+            return Panel(f"[red]Error: {data['error']}[/red]", title="[bold red]Log Rates - Error[/bold red]")
+
+        levels = data.get('levels', [])
+        peak = max((max(level['columns'], default=0) for level in levels), default=0)
+
+        table = Table(show_header=True, header_style="bold blue", box=None, padding=(0, 1))
+        table.add_column("Level", width=9)
+        table.add_column(f"Last {data.get('minutes', self.minutes)}m", width=CHART_WIDTH + 2)
+        table.add_column("Now", justify="right", width=9)
+        table.add_column("Total", justify="right", width=8)
+
+        for level in levels:
+            table.add_row(
+                Text(level['name'].upper(), style=level['style']),
+                Text(self._create_sparkline(level['columns'], peak), style=level['style']),
+                f"{level['rate']:.1f}/s",
+                str(level['total'])
+            )
+
+        footer = Text()
+        footer.append(f"📊 {data.get('column_seconds', 1):.3g}s per column", style="dim")
+        if data.get('dropped_lines'):
+            footer.append(f" | ~{data['dropped_lines']} lines skipped uncounted", style="dim red")
+        if self.filters:
+            footer.append(f" | Filters: {', '.join(self.filters)}", style="dim yellow")
+
+        file_name = os.path.basename(data.get('file', 'unknown'))
+        return Panel(
+            Group(table, "", footer),
+            title=f"[bold green]📈 Log Rates: {file_name}[/bold green]",
+            border_style="green",
+            padding=(1, 2)
+        )
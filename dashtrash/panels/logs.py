@@ -2,94 +2,300 @@
 Logs panel for dashtrash - displays real-time log files with filtering
 """
 
+import glob
 import os
+import re
 import time
-from typing import Dict, Any, List
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 from rich.console import Console
 from rich.syntax import Syntax
 
+from ..config import parse_duration
+from ..logs import (TailReader, CompressedTail, LogMatcher, MultiTail, OffsetIndex, TimestampParser,
+                    JsonLineParser, open_tail)
+from ..logs.tail import DEFAULT_MAX_BYTES
+from ..logs.merge import DEFAULT_RESCAN_INTERVAL
+from ..logs.dedup import LineDeduper, DEFAULT_DEDUP_WINDOW
+
+
+# Config keys that decide what is read; a change to any of them needs a new reader
+READER_KEYS = ('file', 'window', 'timestamp_format', 'glob_interval', 'max_bytes_per_tick', 'watch')
+
 
 class LogsPanel:
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
         self.log_file = self.config.get('file', '/var/log/system.log')
+        self.console = Console()
+        self.max_bytes = self.config.get('max_bytes_per_tick', DEFAULT_MAX_BYTES)
+        self._path = os.path.expanduser(self.log_file)
+        self._lines = deque()
+        self._dedup = None
+        self._configure()
+        
+        # Window mode shows the lines of the last N minutes instead of the last N lines
+        self.window = parse_duration(self.config.get('window'))
+        self._timestamps = TimestampParser(self.config.get('timestamp_format'))
+        self._index = None
+        self._last_timestamp = 0.0
+        
+        self._multi = glob.has_magic(self._path)
+        self._reader = self._create_reader(self.max_lines)
+        if self.window and isinstance(self._reader, TailReader):
+            # Only plain files can be seeked into by byte offset
+            self._index = OffsetIndex(self._timestamps)
+
+    def reconfigure(self, config: Dict[str, Any]) -> bool:
+        """Apply a changed config in place, keeping the reader's offsets and the lines shown
+
+        Returns False when the change is to what is read (see READER_KEYS),
+        which needs a new panel instead.
+        """
+        if any(config.get(key) != self.config.get(key) for key in READER_KEYS):
+            return False
+        if self._multi and config.get('max_lines') != self.config.get('max_lines'):
+            # Merged globs buffer max_lines lines per file in the reader itself
+            return False
+        self.config = config
+        self._configure()
+        return True
+
+    @classmethod
+    def for_render(cls, config: Dict[str, Any] = None) -> "LogsPanel":
+        """Create a panel that only renders snapshots fetched elsewhere (no files are opened)"""
+        panel = cls.__new__(cls)
+        panel.config = config or {}
+        panel._configure_render()
+        return panel
+
+    def _configure(self):
+        """Set up how lines are filtered, parsed and shown from the config"""
+        self._configure_render()
+        self._lines = deque(self._lines, maxlen=self.max_lines)
+        
+        # Filters and colorization keywords are compiled once into one matcher
+        try:
+            self._matcher = LogMatcher(self.filters)
+            self._matcher_error = None
+        except re.error as e:
+            self._matcher = LogMatcher()
+            self._matcher_error = f"Invalid filter pattern: {e}"
+        
+        # JSON-lines logs are shown as extracted fields and filtered by `where`
+        self._structured = None
+        if self.config.get('format') == 'json':
+            try:
+                self._structured = JsonLineParser(
+                    self.config.get('fields'),
+                    self.config.get('extra', []),
+                    self.config.get('where', [])
+                )
+            except (ValueError, re.error) as e:
+                self._matcher_error = str(e)
+        
+        # Repeats of one message collapse into a single counted line
+        dedup_window = self.config.get('dedup_window', DEFAULT_DEDUP_WINDOW)
+        if not self.config.get('dedup'):
+            self._dedup = None
+        elif self._dedup is None or self._dedup.window != max(1, int(dedup_window)):
+            self._dedup = LineDeduper(dedup_window)
+
+    def _configure_render(self):
+        """Set up what render() reads from the config"""
         self.max_lines = self.config.get('max_lines', 15)
         self.filters = self.config.get('filters', [])
-        self.last_position = 0
-        self.console = Console()
+
+    def _create_reader(self, initial_lines: int):
+        """Create the reader for the configured file, starting with its last initial_lines lines"""
+        if self._multi:
+            # A glob follows every matching file as one stream merged by timestamp
+            return MultiTail(
+                self._path, initial_lines, self.max_bytes,
+                rescan_interval=self.config.get('glob_interval', DEFAULT_RESCAN_INTERVAL),
+                timestamp_format=self.config.get('timestamp_format')
+            )
+        # Rotated .gz/.bz2/.xz/.zst files are streamed through a decompressor
+        return open_tail(self._path, initial_lines, self.max_bytes)
 
     def fetch_data(self) -> Dict[str, Any]:
         """Fetch recent log entries"""
         try:
-            # Expand user path
-            log_file = os.path.expanduser(self.log_file)
-            
-            if not os.path.exists(log_file):
-                return {'error': f'Log file not found: {log_file}'}
+            log_file = self._path
             
-            # Read file from last position
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                f.seek(self.last_position)
-                new_lines = f.readlines()
-                self.last_position = f.tell()
+            if self._matcher_error:
+                return {'error': self._matcher_error}
             
-            # If no new lines, get the last few lines for display
-            if not new_lines:
-                with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    all_lines = f.readlines()
-                    new_lines = all_lines[-self.max_lines:] if all_lines else []
+            if self._multi:
+                return self._fetch_merged()
+            if self.window:
+                return self._fetch_window()
             
-            # Filter lines if filters are specified
-            if self.filters:
-                filtered_lines = []
-                for line in new_lines:
-                    for filter_term in self.filters:
-                        if filter_term.lower() in line.lower():
-                            filtered_lines.append(line)
-                            break
-                new_lines = filtered_lines
+            # Lines stream through the matcher into a deque bounded by max_lines,
+            # so a burst never materializes as one big list
+            entry = self._entry
+            dedup = self._dedup
+            try:
+                for line in self._reader.iter_lines():
+                    shown = entry(line)
+                    if shown is None:
+                        continue
+                    if dedup is not None:
+                        dedup.add(shown[0], shown[1], self._timestamps.parse(line))
+                    else:
+                        self._lines.append(shown)
+            except FileNotFoundError:
+                return {'error': f'Log file not found: {log_file}'}
             
-            # Keep only the most recent lines
-            recent_lines = new_lines[-self.max_lines:] if new_lines else []
+            recent_lines = dedup.lines(self.max_lines) if dedup is not None else list(self._lines)
             
             return {
-                'lines': [line.rstrip() for line in recent_lines],
+                'lines': recent_lines,
                 'file': log_file,
                 'total_lines': len(recent_lines),
-                'filters_active': len(self.filters) > 0
+                'filters_active': len(self.filters) > 0,
+                'dropped_lines': self._reader.skipped_lines,
+                'progress': getattr(self._reader, 'progress', 1.0)
             }
             
         except Exception as e:
             return {'error': str(e)}
 
-    def _colorize_log_line(self, line: str) -> Text:
-        """Add colors to log lines based on content"""
-        text = Text()
+    def _fetch_merged(self) -> Dict[str, Any]:
+        """Read every file matching the glob and merge their newest lines"""
+        since = time.time() - self.window if self.window else None
+        if self._dedup is not None:
+            # Repeats collapse across files, so lines go to the deduper instead
+            # of the per-file buffers
+            self._reader.read(self._collect)
+            recent_lines = self._dedup.lines(self.max_lines, since)
+        else:
+            self._reader.read(self._entry)
+            recent_lines = [
+                (f"{os.path.basename(path)} │ {line}", line_style)
+                for path, (line, line_style) in self._reader.newest(self.max_lines, since)
+            ]
+        
+        paths = self._reader.paths
+        if not paths:
+            return {'error': f'No log files match: {self._path}'}
+        
+        return {
+            'lines': recent_lines,
+            'file': self._path,
+            'files': len(paths),
+            'total_lines': len(recent_lines),
+            'filters_active': len(self.filters) > 0,
+            'dropped_lines': self._reader.skipped_lines,
+            'window': self.config.get('window') if self.window else None
+        }
+
+    def _fetch_window(self) -> Dict[str, Any]:
+        """Read new lines and keep the ones inside the time window"""
+        since = time.time() - self.window
+        reader = self._reader
+        
+        try:
+            if reader.identity is None and self._index is not None:
+                # Binary search for where the window starts instead of reading
+                # the whole file; the budget still caps what is read from there
+                reader.open_at(self._index.find(self._path, since))
+            
+            entry = self._entry
+            parse = self._timestamps.parse
+            for line in reader.iter_lines():
+                # Lines without a timestamp (tracebacks) belong to the line before
+                timestamp = parse(line)
+                if timestamp is None:
+                    timestamp = self._last_timestamp
+                else:
+                    self._last_timestamp = timestamp
+                if timestamp < since:
+                    continue
+                shown = entry(line)
+                if shown is None:
+                    continue
+                if self._dedup is not None:
+                    self._dedup.add(shown[0], shown[1], timestamp)
+                else:
+                    self._lines.append((timestamp,) + shown)
+        except FileNotFoundError:
+            return {'error': f'Log file not found: {self._path}'}
         
-        # Color coding based on log level/content
-        line_lower = line.lower()
+        if self._index is not None:
+            self._index.note(reader.identity, reader.line_offset, self._last_timestamp)
+        while self._lines and self._lines[0][0] < since:
+            self._lines.popleft()
         
-        if any(word in line_lower for word in ['error', 'err', 'failed', 'failure']):
-            text.append(line, style="bold red")
-        elif any(word in line_lower for word in ['warning', 'warn', 'deprecated']):
-            text.append(line, style="bold yellow")
-        elif any(word in line_lower for word in ['info', 'information']):
-            text.append(line, style="bold blue")
-        elif any(word in line_lower for word in ['debug', 'trace']):
-            text.append(line, style="dim")
-        elif any(word in line_lower for word in ['success', 'completed', 'ok']):
-            text.append(line, style="bold green")
-        elif 'python' in line_lower:
-            text.append(line, style="bold magenta")
-        elif 'git' in line_lower:
-            text.append(line, style="bold cyan")
+        if self._dedup is not None:
+            recent_lines = self._dedup.lines(self.max_lines, since)
         else:
-            text.append(line, style="white")
+            recent_lines = [(line, line_style) for _, line, line_style in self._lines]
+        return {
+            'lines': recent_lines,
+            'file': self._path,
+            'total_lines': len(recent_lines),
+            'filters_active': len(self.filters) > 0,
+            'dropped_lines': reader.skipped_lines,
+            'window': self.config.get('window')
+        }
+
+    def _match(self, line: str) -> Optional[Tuple[Optional[int], Optional[Dict[str, Any]]]]:
+        """Get the class index (and JSON fields) of a line that passes the filters, or None"""
+        # The same pass that filters a line also picks its class
+        keep, line_class = self._matcher.classify(line)
+        if not keep:
+            return None
+        if self._structured is None:
+            return line_class, None
         
-        return text
+        fields = self._structured.parse(line)
+        if fields is None:
+            return None
+        if fields.get('level') is not None:
+            # The level field is a better guide to the class than the raw JSON
+            _, line_class = self._matcher.classify(str(fields['level']))
+        return line_class, fields
+
+    def _entry(self, line: str) -> Optional[Tuple[str, str]]:
+        """Get the (text, style) a log line is shown as, or None if it is filtered out"""
+        matched = self._match(line)
+        if matched is None:
+            return None
+        line_class, fields = matched
+        text = line if fields is None else self._structured.format(fields)
+        return text, self._matcher.style(line_class)
+
+    def _collect(self, line: str):
+        """Count a line in the deduper (used as the glob reader's transform, so it buffers nothing)"""
+        shown = self._entry(line)
+        if shown is not None:
+            self._dedup.add(shown[0], shown[1], self._timestamps.parse(line))
+        return None
+
+    def watch_paths(self) -> List[str]:
+        """Get the files (or glob) whose changes should wake this panel"""
+        if not self.config.get('watch', True) or isinstance(self._reader, CompressedTail):
+            # A rotated compressed log never changes, so there is nothing to watch
+            return []
+        return [self._path]
+
+    @property
+    def catching_up(self) -> bool:
+        """Whether a compressed file is still being worked through, so the next refresh shouldn't wait"""
+        return getattr(self._reader, 'progress', 1.0) < 1.0
+
+    def close(self):
+        """Release the log file handle"""
+        self._reader.close()
+
+    def _colorize_log_line(self, line: str) -> Text:
+        """Add colors to log lines based on content"""
+        _, line_class = self._matcher.classify(line)
+        return Text(line, style=self._matcher.style(line_class))
 
     def _create_log_entry(self, line: str, index: int) -> str:
         """Format a single log entry with timestamp and styling"""
@@ -113,10 +319,9 @@ class LogsPanel:
         else:
             content_lines = []
             
-            for i, line in enumerate(lines):
+            for line, style in lines:
                 if line.strip():  # Skip empty lines
-                    colored_line = self._colorize_log_line(line)
-                    content_lines.append(colored_line)
+                    content_lines.append(Text(line, style=style))
             
             # Join lines with newlines
             content = Text()
@@ -127,12 +332,20 @@ class LogsPanel:
 
         # Create title with file info
         file_name = os.path.basename(data.get('file', 'unknown'))
+        if data.get('files'):
+            file_name += f" ({data['files']} files)"
         filter_info = f" | Filtered" if data.get('filters_active') else ""
         title = f"[bold green]📜 Logs: {file_name}[/bold green][dim]{filter_info}[/dim]"
         
         # Add footer with stats
         stats_text = Text()
         stats_text.append(f"📊 {data.get('total_lines', 0)} lines", style="dim")
+        if data.get('progress', 1.0) < 1.0:
+            stats_text.append(f" | ⏳ decompressing {data['progress']:.0%}", style="dim cyan")
+        if data.get('window'):
+            stats_text.append(f" | last {data['window']}", style="dim")
+        if data.get('dropped_lines'):
+            stats_text.append(f" | ~{data['dropped_lines']} lines dropped", style="dim red")
         if self.filters:
             stats_text.append(f" | Filters: {', '.join(self.filters)}", style="dim yellow")
 
@@ -2,9 +2,8 @@
 System panel for dashtrash - monitors CPU, memory, disk, and network metrics
 """
 
-import psutil
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from rich.panel import Panel
 from rich.table import Table
 from rich.progress import Progress, BarColumn, TextColumn, SpinnerColumn
@@ -13,44 +12,57 @@ from rich.console import Console, Group
 from rich.columns import Columns
 from rich.align import Align
 
+from ..sampler import MetricsSampler, get_sampler
+from ..history import RESOLUTIONS
+
 
 class SystemPanel:
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None, sampler: Optional[MetricsSampler] = None):
         self.config = config or {}
         self.refresh_interval = self.config.get('refresh_interval', 2)
+        self.sampler = sampler or get_sampler()
         self.console = Console()
         self._last_net_io = None
         self._last_time = None
         
-        # History for mini charts (keep last 20 readings)
-        self._cpu_history = []
-        self._memory_history = []
-        self._disk_history = []
+        # Mini charts show the last 20 points at this resolution (raw, minute, hour)
+        self.history_length = 20
+        self.history_resolution = self.config.get('history_resolution', 'raw')
+        if self.history_resolution not in RESOLUTIONS:
+            self.history_resolution = 'raw'
+
+    @classmethod
+    def for_render(cls, config: Dict[str, Any] = None) -> "SystemPanel":
+        """Create a panel that only renders snapshots fetched elsewhere (no sampler)"""
+        panel = cls.__new__(cls)
+        panel.config = config or {}
+        return panel
 
     def fetch_data(self) -> Dict[str, Any]:
         """Fetch current system metrics"""
         try:
+            metrics = self.sampler.snapshot(
+                'cpu_percent', 'cpu_count', 'cpu_freq', 'virtual_memory',
+                'disk_usage', 'net_io_counters', 'load_avg', 'boot_time'
+            )
+            
             # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            cpu_count = psutil.cpu_count()
-            cpu_freq = psutil.cpu_freq()
+            cpu_percent = metrics['cpu_percent']
+            cpu_count = metrics['cpu_count']
+            cpu_freq = metrics['cpu_freq']
             
             # Memory usage
-            memory = psutil.virtual_memory()
+            memory = metrics['virtual_memory']
             
             # Disk usage (root partition)
-            disk = psutil.disk_usage('/')
+            disk = metrics['disk_usage']
             
             # Network I/O
-            net_io = psutil.net_io_counters()
+            net_io = metrics['net_io_counters']
             net_speed = self._calculate_network_speed(net_io)
             
-            # Load average (Unix-like systems)
-            try:
-                load_avg = psutil.getloadavg()
-            except AttributeError:
-                # Windows doesn't have load average
-                load_avg = (0, 0, 0)
+            # Load average (zeros on systems without one)
+            load_avg = metrics['load_avg']
             
             # Update history
             self._update_history(cpu_percent, memory.percent, (disk.used / disk.total) * 100)
@@ -61,46 +73,41 @@ class SystemPanel:
                     'count': cpu_count,
                     'frequency': cpu_freq.current if cpu_freq else 0,
                     'load_avg': load_avg,
-                    'history': self._cpu_history.copy()
+                    'history': self._get_history('cpu')
                 },
                 'memory': {
                     'total': memory.total,
                     'used': memory.used,
                     'percent': memory.percent,
                     'available': memory.available,
-                    'history': self._memory_history.copy()
+                    'history': self._get_history('memory')
                 },
                 'disk': {
                     'total': disk.total,
                     'used': disk.used,
                     'free': disk.free,
                     'percent': (disk.used / disk.total) * 100,
-                    'history': self._disk_history.copy()
+                    'history': self._get_history('disk')
                 },
                 'network': {
                     'bytes_sent': net_io.bytes_sent,
                     'bytes_recv': net_io.bytes_recv,
                     'speed': net_speed
-                }
+                },
+                'uptime': self._get_uptime(metrics['boot_time'])
             }
         except Exception as e:
             return {'error': str(e)}
 
     def _update_history(self, cpu_percent: float, memory_percent: float, disk_percent: float):
         """Update historical data for mini charts"""
-        max_history = 20
-        
-        self._cpu_history.append(cpu_percent)
-        self._memory_history.append(memory_percent)
-        self._disk_history.append(disk_percent)
-        
-        # Keep only last N readings
-        if len(self._cpu_history) > max_history:
-            self._cpu_history = self._cpu_history[-max_history:]
-        if len(self._memory_history) > max_history:
-            self._memory_history = self._memory_history[-max_history:]
-        if len(self._disk_history) > max_history:
-            self._disk_history = self._disk_history[-max_history:]
+        self.sampler.record('cpu', cpu_percent)
+        self.sampler.record('memory', memory_percent)
+        self.sampler.record('disk', disk_percent)
+
+    def _get_history(self, metric: str):
+        """Get a zero-copy view of the chart history of a metric"""
+        return self.sampler.history(metric).view(self.history_resolution, self.history_length)
 
     def _calculate_network_speed(self, current_net_io) -> Dict[str, float]:
         """Calculate network speed in bytes per second"""
@@ -249,7 +256,7 @@ class SystemPanel:
         footer_text.append(load_info, style="bold cyan")
         footer_text.append(" | ", style="dim")
         footer_text.append("🕐 Uptime: ", style="dim")
-        footer_text.append(f"{self._get_uptime()}", style="bold green")
+        footer_text.append(f"{data.get('uptime', 'Unknown')}", style="bold green")
         footer_text.append(" | ", style="dim")
         footer_text.append("🔄 Refreshing...", style="dim italic")
         
@@ -263,10 +270,9 @@ class SystemPanel:
             padding=(1, 2)
         )
 
-    def _get_uptime(self) -> str:
+    def _get_uptime(self, boot_time: float) -> str:
         """Get system uptime"""
         try:
-            boot_time = psutil.boot_time()
             uptime_seconds = time.time() - boot_time
             
             days = int(uptime_seconds // 86400)
@@ -2,9 +2,8 @@
 Temperature monitoring panel for dashtrash
 """
 
-import psutil
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
@@ -12,30 +11,50 @@ from rich.progress import Progress, BarColumn, TextColumn
 from rich.console import Group
 from rich.align import Align
 
+from ..sampler import MetricsSampler, get_sampler
+from ..history import RESOLUTIONS
+
 
 class TemperaturePanel:
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None, sampler: Optional[MetricsSampler] = None):
         self.config = config or {}
-        self.refresh_interval = self.config.get('refresh_interval', 3)
-        self.temperature_history = []
+        self._configure_render()
+        self.sampler = sampler or get_sampler()
+        
+        # Charts show the last 20 points at this resolution (raw, minute, hour)
+        self.history_length = 20
+        self.history_resolution = self.config.get('history_resolution', 'raw')
+        if self.history_resolution not in RESOLUTIONS:
+            self.history_resolution = 'raw'
         
+    @classmethod
+    def for_render(cls, config: Dict[str, Any] = None) -> "TemperaturePanel":
+        """Create a panel that only renders snapshots fetched elsewhere (no sampler)"""
+        panel = cls.__new__(cls)
+        panel.config = config or {}
+        panel._configure_render()
+        return panel
+
+    def _configure_render(self):
+        """Set up what render() reads from the config"""
+        self.refresh_interval = self.config.get('refresh_interval', 3)
+
     def fetch_data(self) -> Dict[str, Any]:
         """Fetch temperature data from system sensors"""
         try:
             temperatures = {}
             
             # Get CPU temperatures if available
-            if hasattr(psutil, "sensors_temperatures"):
-                temp_info = psutil.sensors_temperatures()
-                
-                for name, entries in temp_info.items():
-                    for entry in entries:
-                        sensor_name = f"{name}_{entry.label}" if entry.label else name
-                        temperatures[sensor_name] = {
-                            'current': entry.current,
-                            'high': entry.high if entry.high else 80.0,
-                            'critical': entry.critical if entry.critical else 90.0
-                        }
+            temp_info = self.sampler.get('sensors_temperatures')
+            
+            for name, entries in temp_info.items():
+                for entry in entries:
+                    sensor_name = f"{name}_{entry.label}" if entry.label else name
+                    temperatures[sensor_name] = {
+                        'current': entry.current,
+                        'high': entry.high if entry.high else 80.0,
+                        'critical': entry.critical if entry.critical else 90.0
+                    }
             
             # If no sensors available, simulate some data for demo
             if not temperatures:
@@ -65,7 +84,9 @@ class TemperaturePanel:
             return {
                 'temperatures': temperatures,
                 'average': avg_temp,
-                'history': self.temperature_history.copy()
+                'history': self.sampler.history('temperature').view(
+                    self.history_resolution, self.history_length
+                )
             }
             
         except Exception as e:
@@ -73,11 +94,7 @@ class TemperaturePanel:
     
     def _update_history(self, avg_temp: float):
         """Update temperature history for mini chart"""
-        max_history = 20
-        self.temperature_history.append(avg_temp)
-        
-        if len(self.temperature_history) > max_history:
-            self.temperature_history = self.temperature_history[-max_history:]
+        self.sampler.record('temperature', avg_temp)
     
     def _get_temp_color(self, current: float, high: float, critical: float) -> str:
         """Get color based on temperature thresholds"""
@@ -5,6 +5,7 @@ Plugins package for dashtrash - extensible plugin system for custom panels
 import importlib
 import os
 from typing import Dict, Any, Optional
+from rich.panel import Panel
 
 
 class PluginManager:
@@ -50,6 +51,48 @@ class PluginManager:
         return None
 
 
+class PluginPanel:
+    """Adapts a plugin module to the fetch_data()/render() interface of the built-in panels"""
+
+    def __init__(self, plugin_name: str, config: Dict[str, Any] = None,
+                 plugin_manager: Optional[PluginManager] = None):
+        self.plugin_name = plugin_name
+        self.config = config or {}
+        self.plugin_manager = plugin_manager or PluginManager()
+
+    def fetch_data(self) -> Dict[str, Any]:
+        """Fetch data from the plugin"""
+        try:
+            plugin = self.plugin_manager.load_plugin(self.plugin_name)
+            if not plugin:
+                return {'error': f"Plugin '{self.plugin_name}' not found"}
+            
+            if hasattr(plugin, 'fetch'):
+                return plugin.fetch()
+            return {}
+        except Exception as e:
+            return {'error': f"Plugin error: {str(e)}"}
+
+    def render(self, data: Dict[str, Any]) -> Panel:
+        """Render the plugin data"""
+        if 'error' in data:
+            return Panel(f"[red]{data['error']}[/red]", 
+                        title="[bold red]Plugin Error[/bold red]")
+        
+        try:
+            plugin = self.plugin_manager.load_plugin(self.plugin_name)
+            if plugin and hasattr(plugin, 'render'):
+                content = plugin.render(data)
+            else:
+                content = str(data)
+        except Exception as e:
+            return Panel(f"[red]Plugin error: {str(e)}[/red]", 
+                        title="[bold red]Plugin Error[/bold red]")
+        
+        return Panel(content, title=f"[bold green]{self.plugin_name}[/bold green]", 
+                    border_style="green")
+
+
 # Plugin interface documentation
 """
 Plugin Interface:
@@ -0,0 +1,426 @@
+"""
+Collector and viewer for dashtrash - sample once, render in any number of terminals
+
+`dashtrash collect` runs the panels' fetch side and publishes their
+snapshots on a Unix domain socket; `dashtrash view` subscribes and only
+renders. Sampling costs the same however many viewers are attached.
+
+Frames are a 4-byte big-endian payload length, a flags byte, and compact
+JSON, zlib-compressed when that pays off. A viewer first gets a `hello`
+with the config, then one `update` per panel with its current snapshot,
+then an `update` whenever a panel is refreshed. Updates whose data didn't
+change leave `data` out.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import stat
+import struct
+import time
+import zlib
+from array import array
+from typing import Any, Dict, Optional
+
+from rich.live import Live
+
+from .config import Config
+from .core import Dashboard, PanelEntry, HEADER_KEY
+from .panels import get_panel_class
+
+
+PROTOCOL_VERSION = 1
+
+# Length of the payload, then flags
+FRAME_HEADER = struct.Struct('>IB')
+
+# Flag set when the payload is zlib-compressed
+FLAG_ZLIB = 0x01
+
+# Payloads smaller than this aren't worth compressing
+COMPRESS_MIN_BYTES = 1024
+
+# Refuse frames larger than this instead of allocating whatever a peer claims
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+# A viewer that falls this far behind is disconnected rather than buffered for
+CLIENT_BUFFER_LIMIT = 4 * 1024 * 1024
+
+# Socket permissions: only the collector's owner by default
+DEFAULT_SOCKET_MODE = 0o600
+
+
+def default_socket_path() -> str:
+    """Get the default collector socket: $XDG_RUNTIME_DIR/dashtrash.sock, else one per user in /tmp"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'dashtrash.sock')
+    return os.path.join('/tmp', f'dashtrash-{os.getuid()}.sock')
+
+
+def _to_json(value: Any) -> Any:
+    """Convert what panels put in their data besides plain JSON types"""
+    if isinstance(value, (memoryview, array)):
+        # History views straight out of the metric store
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """Encode a message as one frame"""
+    payload = json.dumps(message, separators=(',', ':'), default=_to_json).encode()
+    flags = 0
+    if len(payload) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(payload, 1)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= FLAG_ZLIB
+    return FRAME_HEADER.pack(len(payload), flags) + payload
+
+
+def decode_payload(flags: int, payload: bytes) -> Dict[str, Any]:
+    """Decode the payload of a frame"""
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return json.loads(payload)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """Read the next message, or None once the peer has closed the connection"""
+    try:
+        length, flags = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+        if length > MAX_FRAME_BYTES:
+            raise ValueError(f"frame of {length} bytes is larger than {MAX_FRAME_BYTES}")
+        return decode_payload(flags, await reader.readexactly(length))
+    except asyncio.IncompleteReadError:
+        return None
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    """Read exactly size bytes from a blocking socket"""
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("collector closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _receive_frame(sock: socket.socket) -> Dict[str, Any]:
+    """Read one message from a blocking socket, without reading past it"""
+    length, flags = FRAME_HEADER.unpack(_recv_exactly(sock, FRAME_HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"frame of {length} bytes is larger than {MAX_FRAME_BYTES}")
+    return decode_payload(flags, _recv_exactly(sock, length))
+
+
+class Collector(Dashboard):
+    """A dashboard that fetches but doesn't draw, publishing every snapshot to its viewers
+
+    Panels are created, scheduled, watched and hot-reloaded exactly as in a
+    normal dashboard. Each snapshot is encoded once and the same bytes are
+    written to every viewer; a viewer that can't keep up is dropped.
+    """
+
+    def __init__(self, config_path: str = "dashboard.yml", socket_path: Optional[str] = None,
+                 socket_mode: int = DEFAULT_SOCKET_MODE):
+        super().__init__(config_path)
+        self.socket_path = socket_path or default_socket_path()
+        self.socket_mode = socket_mode
+        self._clients = set()
+        self._handlers = set()
+        self._published = {}
+
+    async def run(self):
+        """Run the collector until interrupted"""
+        if not self.config.validate_config():
+            self.console.print("[red]Invalid configuration. Exiting.[/red]")
+            return
+
+        self._remove_stale_socket()
+        server = await asyncio.start_unix_server(self._serve, path=self.socket_path)
+        os.chmod(self.socket_path, self.socket_mode)
+        self.console.print(f"[green]📡 Collecting {len(self.panels)} panels on {self.socket_path}[/green]")
+
+        self.running = True
+        self._wake = asyncio.Event()
+        self._watch_panels()
+
+        try:
+            while self.running:
+                now = time.monotonic()
+
+                if self._reload_due is not None and now >= self._reload_due:
+                    self._reload_due = None
+                    self._reload()
+
+                self._start_due_refreshes(now)
+                self._publish_updates()
+                await self._wait_for_next_frame()
+        finally:
+            server.close()
+            # Hanging up lets the connection handlers finish instead of being cancelled
+            for writer in list(self._clients):
+                writer.transport.abort()
+            if self._handlers:
+                await asyncio.wait(list(self._handlers), timeout=1.0)
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            self._shutdown()
+            self.console.print("[green]Collector stopped.[/green]")
+
+    def _remove_stale_socket(self):
+        """Remove a socket left behind by a collector that died, refusing to replace a live one"""
+        try:
+            mode = os.lstat(self.socket_path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise RuntimeError(f"{self.socket_path} exists and is not a socket")
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                # Another collector starting up removed it first
+                pass
+            except OSError as e:
+                raise RuntimeError(f"can't remove the stale socket {self.socket_path}: {e}")
+        else:
+            raise RuntimeError(f"a collector is already running on {self.socket_path}")
+        finally:
+            probe.close()
+
+    def _reload(self):
+        """Apply an edited config and send every viewer the new config and snapshots"""
+        previous = self._reload_message
+        self._reload_config()
+        if self._reload_message:
+            if self._reload_message != previous:
+                self.console.print(f"[yellow]{self._reload_message}[/yellow]")
+            return
+
+        self.console.print("[green]🔄 Config reloaded[/green]")
+        self._published = {}
+        for writer in list(self._clients):
+            self._send_welcome(writer)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Send a new viewer the config and current snapshots, then keep it subscribed until it leaves"""
+        self._handlers.add(asyncio.current_task())
+        self._clients.add(writer)
+        self._send_welcome(writer)
+        try:
+            # Viewers don't send anything; reading just notices when they go away
+            while await reader.read(4096):
+                pass
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    def _send_welcome(self, writer: asyncio.StreamWriter):
+        """Send one viewer the hello and a snapshot of every panel"""
+        now = time.monotonic()
+        self._send(writer, encode_frame(self._hello()))
+        for entry in self.panels:
+            if entry.state.data is not None or entry.state.error is not None:
+                self._send(writer, encode_frame(self._update(entry, now, True)))
+
+    def _publish_updates(self):
+        """Send every viewer the panels refreshed since the last call"""
+        now = time.monotonic()
+        for entry in self.panels:
+            state = entry.state
+            if state.updated_at is None and state.error is None:
+                continue
+            published = self._published.get(entry.id)
+            if not state.dirty and published == (state.updated_at, state.error):
+                continue
+
+            # Unchanged data goes out as just a fresh timestamp
+            frame = encode_frame(self._update(entry, now, state.dirty))
+            state.dirty = False
+            self._published[entry.id] = (state.updated_at, state.error)
+            for writer in list(self._clients):
+                self._send(writer, frame)
+
+    def _hello(self) -> Dict[str, Any]:
+        """Get the message a viewer builds its panels and layout from"""
+        return {
+            'type': 'hello',
+            'version': PROTOCOL_VERSION,
+            'config': self.config.config,
+            'intervals': {entry.id: self.scheduler.interval(entry.id) for entry in self.panels},
+        }
+
+    def _update(self, entry, now: float, with_data: bool) -> Dict[str, Any]:
+        """Get the message carrying a panel's snapshot"""
+        state = entry.state
+        message = {'type': 'update', 'id': entry.id, 'error': state.error, 'age': state.age(now)}
+        if with_data:
+            message['data'] = state.data
+        return message
+
+    def _send(self, writer: asyncio.StreamWriter, frame: bytes):
+        """Queue a frame for a viewer, dropping the viewer if it has stopped reading"""
+        if writer.is_closing():
+            self._clients.discard(writer)
+            return
+        writer.write(frame)
+        if writer.transport.get_write_buffer_size() > CLIENT_BUFFER_LIMIT:
+            self._clients.discard(writer)
+            writer.transport.abort()
+
+
+class Viewer(Dashboard):
+    """A dashboard that draws the snapshots published by a collector instead of fetching its own
+
+    Only the render side of each panel is built from the collector's config
+    (`for_render`): no log file is opened and no metrics sampler is created,
+    so a viewer costs a socket read and a redraw per update. Config reloads
+    on the collector are applied here the same way.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None):
+        self.socket_path = socket_path or default_socket_path()
+
+        # Read the hello before anything else, so the panels can be built from it
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._socket.connect(self.socket_path)
+            hello = _receive_frame(self._socket)
+        except Exception:
+            self._socket.close()
+            raise
+        if hello.get('type') != 'hello' or hello.get('version') != PROTOCOL_VERSION:
+            self._socket.close()
+            raise RuntimeError(f"collector on {self.socket_path} speaks a different protocol")
+
+        super().__init__(self.socket_path, config=self._config_from(hello))
+        self._set_intervals(hello)
+
+    async def run(self):
+        """Draw the collector's snapshots until interrupted or the collector goes away"""
+        reader, writer = await asyncio.open_unix_connection(sock=self._socket)
+
+        main_layout = self._create_main_layout()
+        self.running = True
+        self.scheduler.add(HEADER_KEY, self.refresh_rate)
+        self._wake = asyncio.Event()
+        self._rebuild = False
+        receiver = asyncio.ensure_future(self._receive(reader))
+
+        with Live(main_layout, console=self.console, auto_refresh=False) as live:
+            try:
+                while self.running:
+                    now = time.monotonic()
+
+                    # Panels are never fetched here; their deadlines only pace the header
+                    due = self.scheduler.due(now)
+                    for key in due:
+                        self.scheduler.advance(key, now)
+
+                    rebuild, self._rebuild = self._rebuild, False
+                    if self._draw_frame(main_layout, now, HEADER_KEY in due, rebuild):
+                        live.refresh()
+
+                    await self._wait_for_next_frame()
+            except KeyboardInterrupt:
+                self.running = False
+
+        receiver.cancel()
+        writer.close()
+        self._shutdown()
+        if self._reload_message:
+            self.console.print(f"[yellow]{self._reload_message}[/yellow]")
+
+    def _config_from(self, hello: Dict[str, Any]) -> Config:
+        """Build the viewer's config from a collector's hello"""
+        settings = dict(hello.get('config') or {})
+        # History files belong to the collector
+        settings.pop('history_dir', None)
+        return Config.from_dict(settings, self.socket_path)
+
+    def _create_panel(self, panel_config: Dict[str, Any]) -> Any:
+        """Create the render side of a panel, or None for an unknown type"""
+        if panel_config.get('type') == 'plugin':
+            # Plugin panels load their plugin to render but fetch nothing until asked
+            return super()._create_panel(panel_config)
+        panel_class = get_panel_class(panel_config.get('type'))
+        return panel_class.for_render(panel_config) if panel_class is not None else None
+
+    def _update_entry(self, entry: PanelEntry, panel_config: Dict[str, Any]) -> bool:
+        """Render a changed panel with its new config, keeping its snapshot unless its type changed"""
+        if panel_config.get('type') != entry.type:
+            return False
+        if panel_config != entry.config:
+            entry.panel = self._create_panel(panel_config)
+            entry.config = panel_config
+            entry.state.dirty = True
+        return True
+
+    def _remove_entry(self, entry: PanelEntry):
+        """Forget a panel; there is nothing to cancel or close"""
+        self.scheduler.remove(entry.id)
+
+    def _set_intervals(self, hello: Dict[str, Any]):
+        """Use the collector's refresh intervals, which decide when a snapshot counts as old"""
+        for panel_id, interval in hello.get('intervals', {}).items():
+            if panel_id in self.panels:
+                self.scheduler.set_interval(panel_id, interval)
+
+    async def _receive(self, reader: asyncio.StreamReader):
+        """Apply messages from the collector as they arrive"""
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message is None:
+                    break
+                if message.get('type') == 'hello':
+                    # The collector reloaded its config
+                    self._rebuild = self._apply_config(self._config_from(message)) or self._rebuild
+                    self._set_intervals(message)
+                elif message.get('type') == 'update':
+                    self._apply_update(message)
+                self._wake.set()
+        except (ConnectionError, ValueError, zlib.error) as e:
+            self._reload_message = f"Lost the collector: {e}"
+        else:
+            self._reload_message = "The collector went away"
+        self.running = False
+        self._wake.set()
+
+    def _apply_update(self, message: Dict[str, Any]):
+        """Store a panel snapshot sent by the collector"""
+        entry = self.panels.get(message.get('id'))
+        if entry is None:
+            return
+        state = entry.state
+        if message.get('error') is not None:
+            state.fail(message['error'], message.get('data'))
+        elif 'data' in message:
+            state.update(message['data'])
+        elif state.error is not None:
+            state.error = None
+            state.dirty = True
+        if message.get('age') is not None:
+            state.updated_at = time.monotonic() - message['age']
+
+    def _create_header(self):
+        """Create the header, noting where the data comes from"""
+        header = super()._create_header()
+        header.renderable.renderable.append(f" | 📡 {os.path.basename(self.socket_path)}", style="dim")
+        return header
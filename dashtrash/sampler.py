@@ -0,0 +1,140 @@
+"""
+Metrics sampler for dashtrash - collects system metrics once and shares them between panels
+"""
+
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+import psutil
+
+from .history import HistoryStore, TieredHistory
+
+
+# A reading is only shared within a tick and while it is younger than this,
+# so panels used outside the dashboard loop still see fresh values
+MAX_SHARED_AGE = 1.0
+
+
+class MetricsSampler:
+    """Collects each metric at most once per tick and hands out read-only snapshots
+
+    The dashboard calls begin_tick() whenever panels become due. The first panel
+    that asks for a metric during a tick collects it; every other panel asking
+    during the same tick gets the same reading, so the cost scales with the
+    number of distinct metrics rather than with the number of panels.
+    """
+
+    def __init__(self):
+        self.tick = 0
+        self._collectors = {}
+        self._static = set()
+        self._readings = {}
+        self._locks = {}
+        self._recorded = {}
+        self._history_lock = threading.Lock()
+        self.history_store = HistoryStore()
+        self._register_defaults()
+
+    def register(self, name: str, collector: Callable[[], Any], static: bool = False):
+        """Register a metric; static metrics are collected once and never again"""
+        self._collectors[name] = collector
+        self._locks[name] = threading.Lock()
+        if static:
+            self._static.add(name)
+
+    def begin_tick(self):
+        """Start a new sampling tick, making every non-static reading due again"""
+        self.tick += 1
+
+    def get(self, name: str) -> Any:
+        """Get the current reading of a metric, collecting it if this tick has none yet"""
+        with self._locks[name]:
+            reading = self._readings.get(name)
+            if reading is not None and self._is_fresh(name, reading):
+                return reading[2]
+
+            value = self._collectors[name]()
+            self._readings[name] = (self.tick, time.monotonic(), value)
+            return value
+
+    def snapshot(self, *names: str) -> Mapping[str, Any]:
+        """Get a read-only mapping of the current readings of several metrics"""
+        return MappingProxyType({name: self.get(name) for name in names})
+
+    def record(self, name: str, value: float):
+        """Append a value to a metric's history, at most once per tick
+
+        Every panel showing a metric may record it; only the first recording
+        in a tick is kept, so two panels never double the history.
+        """
+        with self._history_lock:
+            recorded = self._recorded.get(name)
+            if recorded is not None and self._is_fresh(name, recorded):
+                return
+            self._recorded[name] = (self.tick, time.monotonic(), value)
+            self.history_store.series(name).append(value)
+
+    def use_history_dir(self, directory: str):
+        """Keep histories in memory-mapped files under a directory so they survive restarts"""
+        with self._history_lock:
+            if self.history_store.directory != directory:
+                self.history_store = HistoryStore(directory)
+
+    def history(self, name: str) -> TieredHistory:
+        """Get the recorded history of a metric"""
+        with self._history_lock:
+            return self.history_store.series(name)
+
+    def _is_fresh(self, name: str, reading: tuple) -> bool:
+        """Check whether a stored reading can be shared instead of re-collected"""
+        if name in self._static:
+            return True
+        tick, collected_at, _ = reading
+        return tick == self.tick and time.monotonic() - collected_at < MAX_SHARED_AGE
+
+    def _register_defaults(self):
+        """Register the psutil metrics used by the built-in panels"""
+        # Non-blocking: measures usage since the previous call. The sampler is
+        # the only caller, so that is the time since the last sampled tick.
+        psutil.cpu_percent(interval=None)
+        self.register('cpu_percent', lambda: psutil.cpu_percent(interval=None))
+        self.register('cpu_count', psutil.cpu_count, static=True)
+        self.register('cpu_freq', psutil.cpu_freq)
+        self.register('virtual_memory', psutil.virtual_memory)
+        self.register('disk_usage', lambda: psutil.disk_usage('/'))
+        self.register('net_io_counters', psutil.net_io_counters)
+        self.register('load_avg', _load_average)
+        self.register('boot_time', psutil.boot_time, static=True)
+        self.register('sensors_temperatures', _sensors_temperatures)
+
+
+def _load_average() -> tuple:
+    """Get the load average, or zeros where the platform has none"""
+    try:
+        return psutil.getloadavg()
+    except (AttributeError, OSError):
+        # Windows doesn't have load average
+        return (0, 0, 0)
+
+
+def _sensors_temperatures() -> Mapping[str, tuple]:
+    """Get temperature sensor readings as a read-only mapping"""
+    if not hasattr(psutil, "sensors_temperatures"):
+        return MappingProxyType({})
+    readings = psutil.sensors_temperatures() or {}
+    return MappingProxyType({name: tuple(entries) for name, entries in readings.items()})
+
+
+_default_sampler = None
+_default_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> MetricsSampler:
+    """Get the process-wide sampler shared by all panels"""
+    global _default_sampler
+    with _default_sampler_lock:
+        if _default_sampler is None:
+            _default_sampler = MetricsSampler()
+        return _default_sampler
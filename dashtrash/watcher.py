@@ -0,0 +1,173 @@
+"""
+File watcher for dashtrash - wakes panels when the files they show change
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import fnmatch
+import glob
+import os
+import struct
+import sys
+from typing import Callable, Tuple
+
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+# How often the polling fallback stats a watched path, in seconds
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class InotifyWatcher:
+    """Watches files through Linux inotify, called into via ctypes
+
+    The parent directory of each path is watched rather than the file itself,
+    so files that are created, replaced or rotated are still noticed. The
+    inotify descriptor is read from the event loop, and a burst of events
+    calls each matching callback once.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self._loop = loop
+        self._watches = {}
+        self._directories = {}
+        loop.add_reader(self._fd, self._on_readable)
+
+    def watch(self, path: str, callback: Callable[[], None], interval: float = DEFAULT_POLL_INTERVAL):
+        """Call back whenever a file matching the path (which may be a glob) changes"""
+        directory, pattern = os.path.split(os.path.abspath(os.path.expanduser(path)))
+        wd = self._directories.get(directory)
+        if wd is None:
+            wd = self._add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), directory)
+            self._directories[directory] = wd
+        self._watches.setdefault(wd, []).append((pattern, callback))
+
+    def unwatch(self, callback: Callable[[], None]):
+        """Stop calling back a callback, dropping directory watches nothing needs any more"""
+        for directory, wd in list(self._directories.items()):
+            watches = [watch for watch in self._watches.get(wd, []) if watch[1] is not callback]
+            if watches:
+                self._watches[wd] = watches
+                continue
+            self._watches.pop(wd, None)
+            del self._directories[directory]
+            if self._fd >= 0:
+                self._rm_watch(self._fd, wd)
+
+    def _on_readable(self):
+        """Read pending events and call back the watchers of the files they name"""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        callbacks = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            for pattern, callback in self._watches.get(wd, ()):
+                if fnmatch.fnmatchcase(name, pattern) and callback not in callbacks:
+                    callbacks.append(callback)
+
+        for callback in callbacks:
+            callback()
+
+    def close(self):
+        """Stop watching"""
+        if self._fd >= 0:
+            self._loop.remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Watches files by comparing their stat results on a timer
+
+    Used where inotify isn't available. A path that is a glob is expanded
+    on every poll, so new matching files are noticed too.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._tasks = []
+
+    def watch(self, path: str, callback: Callable[[], None], interval: float = DEFAULT_POLL_INTERVAL):
+        """Call back whenever a file matching the path (which may be a glob) changes"""
+        path = os.path.abspath(os.path.expanduser(path))
+        self._tasks.append((callback, self._loop.create_task(self._poll(path, callback, interval))))
+
+    def unwatch(self, callback: Callable[[], None]):
+        """Stop calling back a callback"""
+        for watched, task in self._tasks:
+            if watched is callback:
+                task.cancel()
+        self._tasks = [(watched, task) for watched, task in self._tasks if watched is not callback]
+
+    async def _poll(self, path: str, callback: Callable[[], None], interval: float):
+        """Stat the watched files every interval and call back when anything changed"""
+        last = _signature(path)
+        while True:
+            await asyncio.sleep(interval)
+            current = _signature(path)
+            if current != last:
+                last = current
+                callback()
+
+    def close(self):
+        """Stop watching"""
+        for _, task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+
+def _signature(path: str) -> Tuple[Tuple[str, int, int, int], ...]:
+    """Get (name, inode, size, mtime) of every file matching a path or glob"""
+    paths = glob.glob(path) if glob.has_magic(path) else [path]
+    signature = []
+    for match in sorted(paths):
+        try:
+            stat = os.stat(match)
+        except OSError:
+            continue
+        signature.append((match, stat.st_ino, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def create_watcher(loop: asyncio.AbstractEventLoop):
+    """Get an inotify watcher on Linux, or a polling watcher elsewhere"""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(loop)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(loop)
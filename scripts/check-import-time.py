@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Startup budget check for dashtrash - fails when the CLI's fast path gets slow to import
+
+`dashtrash --version`, `--validate` and `--create-config` only need
+argparse and the config module. This runs `python -m dashtrash.main
+--validate` on a sample config, and fails if it takes longer than the
+budget over a bare interpreter's startup, or if it imports (under
+`-X importtime`) any of the modules that only a running dashboard needs.
+
+Usage: python scripts/check-import-time.py [--budget MS] [--runs N] [--config PATH]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Validated by default: the showcase config has one panel of most types
+SAMPLE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'dashboard-showcase.yml')
+
+# Modules the fast path must never pull in
+FORBIDDEN_MODULES = ('dashtrash.core', 'dashtrash.panels.', 'dashtrash.sampler',
+                     'rich', 'psutil', 'pyfiglet', 'asyncio')
+
+DEFAULT_BUDGET_MS = 100
+
+
+def validate_command(config: str) -> list:
+    """Get the command line that validates a config"""
+    return [sys.executable, "-m", "dashtrash.main", "--validate", "--config", config]
+
+
+def run_time(command: list) -> float:
+    """Run a command to completion and get its wall time in milliseconds"""
+    start = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        sys.exit(f"❌ {' '.join(command[1:])} failed:\n{result.stdout}{result.stderr}")
+    return elapsed
+
+
+def imported_modules(config: str) -> list:
+    """Validate a config under -X importtime and get the modules it imported"""
+    command = validate_command(config)
+    result = subprocess.run(command[:1] + ["-X", "importtime"] + command[1:],
+                            capture_output=True, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            modules.append(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the startup time of `dashtrash --validate`")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'Budget in milliseconds over a bare interpreter (default: {DEFAULT_BUDGET_MS})')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Best of this many runs is compared to the budget (default: 5)')
+    parser.add_argument('--config', default=os.path.normpath(SAMPLE_CONFIG),
+                        help='Config file to validate (default: dashboard-showcase.yml)')
+    args = parser.parse_args()
+
+    command = validate_command(args.config)
+    runs = max(1, args.runs)
+    # Interpreter startup differs between machines and isn't ours to budget
+    baseline = min(run_time([sys.executable, "-c", "pass"]) for _ in range(runs))
+    best = min(run_time(command) for _ in range(runs)) - baseline
+    modules = imported_modules(args.config)
+
+    forbidden = sorted(name for name in modules
+                       if any(name == bad or name.startswith(bad if bad.endswith('.') else bad + '.')
+                              for bad in FORBIDDEN_MODULES))
+    print(f"⏱️  dashtrash --validate: {best:.1f}ms over interpreter startup (budget {args.budget:.0f}ms, "
+          f"{len(modules)} modules, best of {runs})")
+
+    failed = False
+    if forbidden:
+        print(f"❌ --validate imports modules only a running dashboard needs: {', '.join(forbidden)}")
+        failed = True
+    if best > args.budget:
+        print(f"❌ --validate is over budget by {best - args.budget:.1f}ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ Within budget")
+
+
+if __name__ == "__main__":
+    main()
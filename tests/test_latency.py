@@ -0,0 +1,39 @@
+"""
+Tests for the latency panel's handling of values the sketch can't take
+"""
+
+import math
+
+from dashtrash.logs.sketch import QuantileSketch
+from dashtrash.panels.latency import LatencyPanel
+
+
+def test_sketch_ignores_non_finite_values():
+    sketch = QuantileSketch()
+    for value in (float('inf'), float('-inf'), float('nan')):
+        sketch.add(value)
+    sketch.add(0.25)
+    assert sketch.count == 1
+    assert math.isclose(sketch.quantile(0.5), 0.25, rel_tol=0.01)
+
+
+def test_non_finite_line_does_not_break_the_next_fetch(tmp_path):
+    log = tmp_path / 'access.log'
+    log.write_text('')
+    panel = LatencyPanel({'file': str(log), 'field': 'rt', 'unit': 's'})
+    assert 'error' not in panel.fetch_data()
+
+    with log.open('a') as f:
+        f.write('GET / rt=1e999\n')
+        f.write('GET / rt=nan\n')
+        f.write('GET / rt=-1\n')
+        f.write('GET / rt=0.5\n')
+    data = panel.fetch_data()
+    assert 'error' not in data
+    assert data['windows'][0]['count'] == 1
+
+    with log.open('a') as f:
+        f.write('GET / rt=0.25\n')
+    data = panel.fetch_data()
+    assert 'error' not in data
+    assert data['windows'][0]['count'] == 2